@@ -1,12 +1,38 @@
 from flask import Flask, request, jsonify
+import logging
 import os
 import base64
 import uuid
-from src.anti_spoof_predict import predict_image
+from src.anti_spoof_predict import predict_image, decode_image
+from src.model_registry import get_registry
+from src.batch_engine import BatchInferenceEngine
 
 app = Flask(__name__)
 UPLOAD_FOLDER = './uploads'
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# 디버깅용으로 요청 이미지를 남기고 싶을 때만 DEBUG_CAPTURE=1 로 켬 (평소에는 디스크를 쓰지 않음)
+DEBUG_CAPTURE = os.environ.get('DEBUG_CAPTURE', '0') == '1'
+if DEBUG_CAPTURE:
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+# 모델 로드 통계 등 src 모듈의 INFO 로그를 출력
+logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s in %(name)s: %(message)s')
+
+# 서버 시작 시 검출기/안티스푸핑 모델을 한 번만 로드
+registry = get_registry()
+
+# 동시 요청을 모아서 모델별 1회 forward로 처리 (BATCH_INFERENCE=0 이면 요청마다 개별 추론)
+engine = None
+if os.environ.get('BATCH_INFERENCE', '1') == '1':
+    engine = BatchInferenceEngine(
+        registry,
+        window_ms=float(os.environ.get('BATCH_WINDOW_MS', '5')),
+        max_batch=int(os.environ.get('BATCH_MAX_SIZE', '32')),
+    )
+
+
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify({'status': 'ok', 'registry': registry.stats()})
 
 @app.route('/predict', methods=['POST'])
 def predict():
@@ -24,19 +50,14 @@ def predict():
         # base64 디코딩
         image_data = base64.b64decode(base64_str)
 
-        # 저장할 고유 파일명 생성
-        filename = f"{uuid.uuid4().hex}.jpg"
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        if DEBUG_CAPTURE:
+            filepath = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex}.jpg")
+            with open(filepath, 'wb') as f:
+                f.write(image_data)
 
-        # 이미지 저장
-        with open(filepath, 'wb') as f:
-            f.write(image_data)
-        
-        # 이미지 예측
-        result = predict_image(filepath)
-    
-        # 이미지 파일 삭제
-        os.remove(filepath)
+        # 메모리에서 바로 디코딩 후 예측
+        image = decode_image(image_data)
+        result = predict_image(image, registry=registry, engine=engine)
 
         return jsonify(result)
 
@@ -44,4 +65,4 @@ def predict():
         return jsonify({'error': f'Image processing failed: {str(e)}'}), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001)
+    app.run(host='0.0.0.0', port=5001, threaded=True)
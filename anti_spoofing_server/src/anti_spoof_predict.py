@@ -75,60 +75,84 @@ class AntiSpoofPredict(Detection):
             self.model.load_state_dict(new_state_dict)
         else:
             self.model.load_state_dict(state_dict)
-        return None
+        self.model.eval()
+        return self.model
 
-    def predict(self, img, model_path):
+    def predict(self, img, model_path=None, model=None):
+        # model이 주어지면 (ModelRegistry에 미리 로드된 모델) 디스크에서 다시 읽지 않음
         test_transform = trans.Compose([
             trans.ToTensor(),
         ])
         img = test_transform(img)
         img = img.unsqueeze(0).to(self.device)
-        self._load_model(model_path)
-        self.model.eval()
+        if model is None:
+            model = self._load_model(model_path)
         with torch.no_grad():
-            result = self.model.forward(img)
-            result = F.softmax(result).cpu().numpy()
+            result = model.forward(img)
+            result = F.softmax(result, dim=1).cpu().numpy()
         return result
 
 
+def decode_image(image_bytes):
+    # 임시 파일 없이 메모리 버퍼에서 바로 디코딩 (복사 없이 numpy view 사용)
+    buffer = np.frombuffer(image_bytes, dtype=np.uint8)
+    if buffer.size == 0:
+        return None
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+
 def check_image(image):
     height, width, _ = image.shape
     return abs(width / height - 4 / 3) <= 0.05
 
 
-def predict_image(image_path, model_dir="./resources/anti_spoof_models", device_id=0):
-    model_test = AntiSpoofPredict(device_id)
+def predict_image(image, model_dir="./resources/anti_spoof_models", device_id=0, registry=None, engine=None):
+    # image: 디코딩된 BGR ndarray 또는 (기존 호환용) 이미지 파일 경로
+    # engine: BatchInferenceEngine 이 주어지면 동시 요청들과 묶어서 모델별 1회 forward로 추론
+    # registry가 없으면 프로세스 공용 레지스트리를 사용 (모델은 최초 1회만 로드됨)
+    if registry is None:
+        from src.model_registry import get_registry
+        registry = get_registry(model_dir=model_dir, device_id=device_id)
     image_cropper = CropImage()
 
-    image = cv2.imread(image_path)
-    if image is None:
-        return {'error': f"Image '{image_path}' not found or cannot be opened."}
+    if isinstance(image, str):
+        image_path = image
+        image = cv2.imread(image_path)
+        if image is None:
+            return {'error': f"Image '{image_path}' not found or cannot be opened."}
+    elif image is None:
+        return {'error': 'Image cannot be decoded.'}
 
     if not check_image(image):
         return {'error': 'Image aspect ratio must be 4:3'}
 
-    image_bbox = model_test.get_bbox(image)
-    prediction = np.zeros((1, 3))
-    test_speed = 0
+    image_bbox = registry.get_bbox(image)
 
-    for model_name in os.listdir(model_dir):
-        if not model_name.endswith('.pth'):
-            continue
-        h_input, w_input, model_type, scale = parse_model_name(model_name)
+    # 모델별 입력 패치 생성 (registry.models 순서와 동일)
+    patches = []
+    for loaded in registry.models:
         param = {
             "org_img": image,
             "bbox": image_bbox,
-            "scale": scale,
-            "out_w": w_input,
-            "out_h": h_input,
+            "scale": loaded.scale,
+            "out_w": loaded.w_input,
+            "out_h": loaded.h_input,
             "crop": True,
         }
-        if scale is None:
+        if loaded.scale is None:
             param["crop"] = False
-        img = image_cropper.crop(**param)
-        start = time.time()
-        prediction += model_test.predict(img, os.path.join(model_dir, model_name))
-        test_speed += time.time() - start
+        patches.append(image_cropper.crop(**param))
+
+    if engine is not None:
+        prediction, test_speed = engine.submit(patches).result()
+        prediction = prediction.reshape(1, 3)
+    else:
+        prediction = np.zeros((1, 3))
+        test_speed = 0
+        for loaded, img in zip(registry.models, patches):
+            start = time.time()
+            prediction += registry.predictor.predict(img, model=loaded.model)
+            test_speed += time.time() - start
 
     label = int(np.argmax(prediction))
     value = float(prediction[0][label] / 2)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+동시에 들어온 /predict 요청을 짧은 시간 창(window) 동안 모아서
+MiniFASNet 모델별로 한 번의 forward 로 추론하는 마이크로 배칭 엔진
+
+- 요청 스레드: 얼굴 검출 + 패치 크롭 + 텐서 변환 후 submit() 으로 큐에 넣고 Future 를 기다림
+- 워커 스레드: window_ms 동안(또는 max_batch 개까지) 모은 뒤 모델별로 torch.stack → forward → softmax
+  결과(모델별 softmax 합)와 배치 추론 시간을 각 요청의 Future 로 돌려줌
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from src.data_io import transform as trans
+
+
+class _Job:
+    __slots__ = ('tensors', 'future')
+
+    def __init__(self, tensors):
+        self.tensors = tensors
+        self.future = Future()
+
+
+class BatchInferenceEngine:
+    def __init__(self, registry, window_ms=5, max_batch=32):
+        self.registry = registry
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._transform = trans.Compose([
+            trans.ToTensor(),
+        ])
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='batch-inference', daemon=True)
+        self._worker.start()
+
+    def submit(self, patches):
+        # patches 는 registry.models 순서와 같은 모델별 입력 이미지 리스트
+        job = _Job([self._transform(img) for img in patches])
+        self._queue.put(job)
+        return job.future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                predictions, elapsed = self._infer(batch)
+            except Exception as e:
+                for job in batch:
+                    job.future.set_exception(e)
+                continue
+            for job, prediction in zip(batch, predictions):
+                job.future.set_result((prediction, elapsed))
+
+    def _infer(self, batch):
+        start = time.time()
+        device = self.registry.predictor.device
+        predictions = np.zeros((len(batch), 3))
+        with torch.no_grad():
+            for index, loaded in enumerate(self.registry.models):
+                inputs = torch.stack([job.tensors[index] for job in batch]).to(device)
+                result = loaded.model.forward(inputs)
+                predictions += F.softmax(result, dim=1).cpu().numpy()
+        return predictions, time.time() - start
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FacepassConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'events'
+
+    def ready(self):
+        from . import signals  # noqa: F401  응답 캐시 무효화 시그널 등록
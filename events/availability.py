@@ -0,0 +1,155 @@
+"""
+존별 잔여석(Zone.available_count) 관리
+
+- 좌석 상태가 바뀌는 트랜잭션 안에서 F 표현식으로 증감 (동시성에 안전한 UPDATE ... SET x = x + n)
+- 커밋 후 같은 증감량을 Redis 해시(zone_available)에 HINCRBY 로 반영해 좌석 조회 폴링은 Redis 에서 읽음
+  (DB 값을 다시 읽어 덮어쓰면 커밋 순서와 on_commit 실행 순서가 엇갈릴 때 옛 값이 남을 수 있음)
+  (같은 시점에 해당 존의 좌석맵 캐시도 무효화하고, 좌석 변경분을 좌석 스트림으로 발행)
+- 주기적으로 Seat 기준으로 다시 세어 어긋난 값을 바로잡음 (reconcile_available_counts)
+"""
+import logging
+
+import redis
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from ticket_backend.redis_client import get_redis
+from .models import Seat, Zone
+from .seat_map import invalidate_seat_maps
+from .streams import publish_seat_changes
+
+logger = logging.getLogger(__name__)
+
+ZONE_AVAILABLE_KEY = 'zone_available'
+
+# 캐시에 있는 존만 증감하고 없는 존은 false 반환 (빈 필드에 HINCRBY 하면 0 기준으로 잘못 쌓임)
+_INCR_SCRIPT = """
+local counts = {}
+for i = 1, #ARGV, 2 do
+    if redis.call('HEXISTS', KEYS[1], ARGV[i]) == 1 then
+        counts[#counts + 1] = redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+    else
+        counts[#counts + 1] = false
+    end
+end
+return counts
+"""
+
+
+def adjust_available_counts(deltas, changes=None):
+    # deltas: {zone_id: 증감량}. 같은 증감량의 존끼리 묶어 UPDATE 한 번씩 실행
+    # changes: {zone_id: [(seat_id, seat_status), ...]} 커밋 후 좌석 스트림으로 보낼 변경분
+    zones_by_delta = {}
+    for zone_id, delta in deltas.items():
+        if delta:
+            zones_by_delta.setdefault(delta, []).append(zone_id)
+    for delta, zone_ids in zones_by_delta.items():
+        Zone.objects.filter(id__in=zone_ids).update(available_count=F('available_count') + delta)
+
+    deltas = {zone_id: delta for zone_id, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: _after_commit(deltas, changes or {}))
+
+
+def _after_commit(deltas, changes):
+    zone_ids = list(deltas)
+    counts = increment_cached_counts(deltas)
+    try:
+        invalidate_seat_maps(zone_ids)
+    except Exception as e:
+        logger.error(f"[Availability] 좌석맵 캐시 무효화 실패 {zone_ids}: {e}")
+    for zone_id, seats in changes.items():
+        publish_seat_changes(zone_id, seats, counts.get(zone_id))
+
+
+def _apply(seats, seat_status, sign):
+    # seats: [(seat_id, zone_id), ...]
+    changes = {}
+    for seat_id, zone_id in seats:
+        changes.setdefault(zone_id, []).append((seat_id, seat_status))
+    deltas = {zone_id: sign * len(zone_seats) for zone_id, zone_seats in changes.items()}
+    adjust_available_counts(deltas, changes)
+
+
+def release_seats(seats):
+    # seats: available 로 풀린 좌석의 (seat_id, zone_id) 목록
+    _apply(seats, 'available', 1)
+
+
+def claim_seats(seats):
+    # seats: booked 로 잡힌 좌석의 (seat_id, zone_id) 목록
+    _apply(seats, 'booked', -1)
+
+
+def increment_cached_counts(deltas):
+    # 반환: {zone_id: 캐시에 반영된 잔여석}. 캐시에 없던 존은 DB 값으로 채움 (HSETNX 라 먼저 들어온 값은 덮지 않음)
+    # 어긋난 값은 reconcile_available_counts 가 refresh_cached_counts 로 통째로 바로잡음
+    args = [value for zone_id, delta in deltas.items() for value in (zone_id, delta)]
+    client = get_redis()
+    try:
+        results = client.eval(_INCR_SCRIPT, 1, ZONE_AVAILABLE_KEY, *args)
+        counts = {zone_id: int(count) for zone_id, count in zip(deltas, results) if count is not None}
+        missing = [zone_id for zone_id in deltas if zone_id not in counts]
+        if missing:
+            seeded = dict(Zone.objects.filter(id__in=missing).values_list('id', 'available_count'))
+            pipe = client.pipeline(transaction=False)
+            for zone_id, count in seeded.items():
+                pipe.hsetnx(ZONE_AVAILABLE_KEY, zone_id, count)
+            pipe.execute()
+            counts.update(seeded)
+    except redis.RedisError as e:
+        logger.error(f"[Availability] 잔여석 캐시 증감 실패 {deltas}: {e}")
+        return {}
+    return counts
+
+
+def refresh_cached_counts(zone_ids=None):
+    queryset = Zone.objects.all()
+    if zone_ids is not None:
+        queryset = queryset.filter(id__in=list(zone_ids))
+    counts = dict(queryset.values_list('id', 'available_count'))
+    if not counts:
+        return counts
+    try:
+        get_redis().hset(ZONE_AVAILABLE_KEY, mapping=counts)
+    except redis.RedisError as e:
+        logger.error(f"[Availability] 잔여석 캐시 갱신 실패: {e}")
+    return counts
+
+
+def get_available_count(zone):
+    try:
+        cached = get_redis().hget(ZONE_AVAILABLE_KEY, zone.id)
+    except redis.RedisError:
+        cached = None
+    if cached is None:
+        return zone.available_count
+    return int(cached)
+
+
+def reconcile_available_counts():
+    # Seat 테이블에서 존별 available 좌석 수를 다시 세어 Zone.available_count 와 다르면 보정
+    actual = dict(
+        Seat.objects
+        .filter(seat_status='available', is_deleted=False)
+        .values('zone_id')
+        .annotate(count=Count('id'))
+        .values_list('zone_id', 'count')
+    )
+    mismatched = [
+        zone_id for zone_id, stored in Zone.objects.values_list('id', 'available_count')
+        if stored != actual.get(zone_id, 0)
+    ]
+    if mismatched:
+        # 세는 사이 예매가 있었을 수 있으므로 UPDATE 시점에 서브쿼리로 다시 계산
+        recount = (
+            Seat.objects
+            .filter(zone=OuterRef('pk'), seat_status='available', is_deleted=False)
+            .values('zone')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        Zone.objects.filter(id__in=mismatched).update(available_count=Coalesce(Subquery(recount), 0))
+    refresh_cached_counts()
+    return len(mismatched)
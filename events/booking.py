@@ -0,0 +1,177 @@
+"""
+좌석 예매 / 결제 확정 서비스
+
+요청한 좌석을 하나의 트랜잭션 안에서 조건부 UPDATE 한 번으로 선점한다.
+  UPDATE seat SET seat_status='booked' WHERE id IN (...) AND seat_status='available'
+갱신된 행 수가 요청 좌석 수와 다르면 (다른 사람이 먼저 잡았거나 없는 좌석) 전체를 롤백하므로
+동시에 같은 좌석을 예매해도 중복 예매가 생기지 않는다.
+
+결제 확정도 같은 방식으로 '결제 전' 상태인 구매만 조건부 UPDATE 하고,
+티켓을 reserved 로 바꾼 뒤 커밋 후에 좌석 홀드를 한 번에 해제한다.
+"""
+import logging
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tickets.holds import release_holds
+from tickets.models import Purchase, Ticket
+from tickets.tasks import pregenerate_ticket_qr
+from .availability import claim_seats
+from .models import Seat
+
+logger = logging.getLogger(__name__)
+
+
+class BookingError(Exception):
+    status_code = 400
+
+    def __init__(self, message, seat_ids=None):
+        super().__init__(message)
+        self.message = message
+        self.seat_ids = seat_ids or []
+
+
+class SeatsNotFound(BookingError):
+    status_code = 404
+
+
+class SeatsUnavailable(BookingError):
+    status_code = 400
+
+
+class SeatsNotInEvent(BookingError):
+    status_code = 400
+
+
+class PurchaseNotFound(BookingError):
+    status_code = 404
+
+
+class PurchaseNotPayable(BookingError):
+    status_code = 409
+
+
+class _ClaimFailed(Exception):
+    pass
+
+
+def _diagnose(seat_ids):
+    # 선점 실패 원인 확인 (트랜잭션 롤백 이후 현재 상태 기준)
+    found = dict(Seat.objects.filter(id__in=seat_ids).values_list('id', 'seat_status'))
+    missing = [seat_id for seat_id in seat_ids if seat_id not in found]
+    if missing:
+        return SeatsNotFound('Some seats not found.', missing)
+    unavailable = [seat_id for seat_id in seat_ids if found[seat_id] != 'available']
+    return SeatsUnavailable(f'이미 선택된 좌석입니다: {unavailable}', unavailable)
+
+
+def book_seats(user, seat_ids, event_id):
+    """
+    event_id 공연의 좌석을 선점하고 Purchase/Ticket 을 생성한다.
+    반환: (purchase, ticket_ids)  /  실패 시 SeatsNotInEvent, SeatsNotFound, SeatsUnavailable
+    """
+    try:
+        seat_ids = list(dict.fromkeys(int(seat_id) for seat_id in seat_ids))  # 중복 제거 (순서 유지)
+    except (TypeError, ValueError):
+        raise BookingError('seat_id must be a list of integers.')
+
+    # 대기열 입장은 공연 단위이므로 다른 공연의 좌석은 받지 않음
+    # (좌석이 속한 존/회차는 바뀌지 않으니 선점 트랜잭션 밖에서 확인해도 됨)
+    foreign = list(
+        Seat.objects
+        .filter(id__in=seat_ids)
+        .exclude(zone__event_time__event_id=event_id)
+        .values_list('id', flat=True)
+    )
+    if foreign:
+        raise SeatsNotInEvent(f'다른 공연의 좌석입니다: {sorted(foreign)}', sorted(foreign))
+    now = timezone.now()
+
+    try:
+        with transaction.atomic():
+            claimed = (
+                Seat.objects
+                .filter(id__in=seat_ids, seat_status='available')
+                .update(seat_status='booked', updated_at=now)
+            )
+            if claimed != len(seat_ids):
+                raise _ClaimFailed()
+            claim_seats(Seat.objects.filter(id__in=seat_ids).values_list('id', 'zone_id'))
+
+            purchase = Purchase.objects.create(
+                user=user,
+                purchase_status="결제 전",
+                is_deleted=False
+            )
+            tickets = Ticket.objects.bulk_create([
+                Ticket(
+                    user=user,
+                    seat_id=seat_id,
+                    purchase=purchase,
+                    ticket_status='booked',
+                    booked_at=now,
+                    face_verified=False,
+                    verified_at=None,
+                    is_deleted=False
+                )
+                for seat_id in seat_ids
+            ])
+            if connection.features.can_return_rows_from_bulk_insert:
+                ticket_ids = [ticket.id for ticket in tickets]
+            else:
+                # MySQL 은 bulk insert 후 PK 를 돌려주지 않으므로 한 번 더 조회
+                ticket_ids = list(
+                    Ticket.objects.filter(purchase=purchase).order_by('id').values_list('id', flat=True)
+                )
+    except _ClaimFailed:
+        raise _diagnose(seat_ids) from None
+
+    return purchase, ticket_ids
+
+
+def _pregenerate_qr(ticket_ids):
+    # 브로커 장애로 결제 응답이 실패하지 않도록 (QR 은 조회 시점에 만들어도 됨)
+    try:
+        pregenerate_ticket_qr.delay(ticket_ids)
+    except Exception as e:
+        logger.error(f"[Booking] QR 사전 생성 예약 실패 {ticket_ids}: {e}")
+
+
+def confirm_payment(user, purchase_id, purchaser, phone_number, email):
+    """
+    '결제 전' 구매를 결제 완료로 바꾸고 booked 티켓을 reserved 로 확정한다.
+    반환: 확정된 ticket_ids  /  실패 시 PurchaseNotFound, PurchaseNotPayable
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            paid = (
+                Purchase.objects
+                .filter(id=purchase_id, user=user, is_deleted=False, purchase_status='결제 전')
+                .update(purchase_status='completed', purchaser=purchaser, phone_number=phone_number,
+                        email=email, updated_at=now)
+            )
+            if not paid:
+                raise _ClaimFailed()
+
+            # 홀드 만료로 이미 취소된 티켓은 제외 (스위퍼와 같은 행을 잠가서 동시에 취소되지 않도록 함)
+            ticket_ids = list(
+                Ticket.objects
+                .select_for_update()
+                .filter(purchase_id=purchase_id, ticket_status='booked')
+                .values_list('id', flat=True)
+            )
+            if not ticket_ids:
+                raise PurchaseNotPayable('예매 유효 시간이 지나 좌석이 취소되었습니다. 다시 예매해 주세요.')
+            Ticket.objects.filter(id__in=ticket_ids).update(ticket_status='reserved', updated_at=now)
+
+            # 결제된 티켓은 자동취소 대상에서 제외하고, QR 이미지는 미리 만들어 둠
+            transaction.on_commit(lambda: release_holds(ticket_ids))
+            transaction.on_commit(lambda: _pregenerate_qr(ticket_ids))
+    except _ClaimFailed:
+        if not Purchase.objects.filter(id=purchase_id, user=user, is_deleted=False).exists():
+            raise PurchaseNotFound('해당 구매 정보를 찾을 수 없습니다.') from None
+        raise PurchaseNotPayable('이미 결제되었거나 결제할 수 없는 구매입니다.') from None
+
+    return ticket_ids
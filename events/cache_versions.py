@@ -0,0 +1,26 @@
+"""
+버전 번호 기반 캐시 무효화 (좌석맵 / 공연 응답 캐시 공용)
+
+캐시 키에 버전 번호를 넣어두고, 데이터가 바뀌면 키를 지우는 대신 버전만 올린다.
+(키를 지우면 무효화 직전에 DB 를 읽은 요청이 지운 뒤에 이전 값을 다시 저장할 수 있음.
+ 버전을 올리면 그런 요청은 이전 버전 키에 쓰게 되어 새 조회에 보이지 않음)
+버전 키는 만료 없이 두고, 버전별 데이터 키에만 TTL 을 건다.
+"""
+from django.core.cache import cache
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # 동시에 처음 조회해도 같은 값을 쓰도록 add 후 다시 읽음
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # 버전 키가 없으면 1 버전으로 캐시된 값도 없음 (그 사이 다른 요청이 만든 키는 덮지 않음)
+        cache.add(key, 2, None)
@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from events.booking import book_seats, BookingError
+from events.models import Event, EventTime, Seat, Zone
+from tickets.models import Ticket
+from user.models import User
+
+
+class Command(BaseCommand):
+    help = "동시 예매 부하에서 book_seats 의 처리량과 중복 예매 여부를 측정합니다. (임시 데이터 생성 후 삭제)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seats', type=int, default=200, help='테스트 존의 좌석 수')
+        parser.add_argument('--workers', type=int, default=50, help='동시에 예매하는 스레드 수')
+        parser.add_argument('--attempts', type=int, default=20, help='스레드당 예매 시도 횟수')
+        parser.add_argument('--seats-per-order', type=int, default=2, help='한 번에 예매하는 좌석 수')
+        parser.add_argument('--keep', action='store_true', help='측정 후 임시 데이터를 지우지 않음')
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            email=f"bench_{tag}@example.com", password=uuid.uuid4().hex, name="bench", phone="000"
+        )
+        event = Event.objects.create(
+            name=f"bench-{tag}", artist="bench", location="bench", description="",
+            genre="bench", age_rating="all", image_url=""
+        )
+        event_time = EventTime.objects.create(
+            event=event, start_time="19:00", end_time="21:00", event_date="2099-01-01"
+        )
+        zone = Zone.objects.create(
+            event_time=event_time, price=1000, rank="A",
+            total_count=options['seats'], available_count=options['seats']
+        )
+        Seat.objects.bulk_create([
+            Seat(zone=zone, seat_number=str(number), seat_status='available')
+            for number in range(1, options['seats'] + 1)
+        ])
+        seat_ids = list(Seat.objects.filter(zone=zone).values_list('id', flat=True))
+
+        results = Counter()
+        latencies = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                for _ in range(options['attempts']):
+                    chosen = random.sample(seat_ids, options['seats_per_order'])
+                    start = time.perf_counter()
+                    try:
+                        book_seats(user, chosen, event.id)
+                        outcome = 'booked'
+                    except BookingError:
+                        outcome = 'conflict'
+                    except Exception:
+                        outcome = 'error'
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        results[outcome] += 1
+                        latencies.append(elapsed)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['workers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - started
+
+        # 같은 좌석에 티켓이 두 장 이상이면 중복 예매
+        per_seat = Counter(Ticket.objects.filter(seat__zone=zone).values_list('seat_id', flat=True))
+        double_booked = [seat_id for seat_id, count in per_seat.items() if count > 1]
+        booked_seats = Seat.objects.filter(zone=zone, seat_status='booked').count()
+
+        latencies.sort()
+        total = len(latencies)
+        self.stdout.write(
+            f"요청 {total}건 / {duration:.2f}s ({total / duration:.1f} req/s), "
+            f"성공 {results['booked']}, 충돌 {results['conflict']}, 오류 {results['error']}"
+        )
+        if total:
+            self.stdout.write(
+                f"지연시간 p50={latencies[total // 2] * 1000:.1f}ms "
+                f"p95={latencies[int(total * 0.95) - 1] * 1000:.1f}ms"
+            )
+        self.stdout.write(f"booked 좌석 {booked_seats}, 티켓 {sum(per_seat.values())}")
+
+        if not options['keep']:
+            event.delete()
+            user.delete()
+
+        if double_booked or booked_seats != sum(per_seat.values()):
+            self.stderr.write(self.style.ERROR(f"중복 예매 발견: {double_booked}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("중복 예매 없음"))
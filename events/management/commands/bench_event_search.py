@@ -0,0 +1,79 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from events.models import Event
+from events.search import search_events, use_fulltext
+
+SYLLABLES = "가나다라마바사아자차카타파하강남동서울별빛바다하늘노래소리밤낮봄여름가을겨울"
+GENRES = ["concert", "musical", "play", "classic", "festival"]
+
+
+def _random_word(length):
+    return ''.join(random.choice(SYLLABLES) for _ in range(length))
+
+
+class Command(BaseCommand):
+    help = "공연 수를 늘려가며 키워드 검색(FULLTEXT vs icontains) 지연시간을 측정합니다. (임시 데이터 생성 후 삭제)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,50000', help='단계별 누적 공연 수 (쉼표 구분)')
+        parser.add_argument('--queries', type=int, default=50, help='단계별 검색 횟수')
+        parser.add_argument('--limit', type=int, default=10, help='페이지 크기')
+        parser.add_argument('--keep', action='store_true', help='측정 후 임시 데이터를 지우지 않음')
+
+    def _measure(self, build, keywords, limit):
+        latencies = []
+        for keyword in keywords:
+            started = time.perf_counter()
+            queryset = build(keyword)
+            queryset.count()
+            list(queryset[:limit])
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        location = f"bench-{tag}"  # 정리용 표시
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        created = 0
+
+        def fulltext(keyword):
+            return search_events(Event.objects.filter(is_deleted=False), keyword)
+
+        def like(keyword):
+            return Event.objects.filter(is_deleted=False).filter(
+                Q(artist__icontains=keyword) | Q(name__icontains=keyword)
+            )
+
+        try:
+            for size in sizes:
+                batch = [
+                    Event(
+                        name=f"{_random_word(3)} {_random_word(2)}", artist=_random_word(3),
+                        location=location, description="", genre=random.choice(GENRES),
+                        age_rating="all", image_url=""
+                    )
+                    for _ in range(size - created)
+                ]
+                Event.objects.bulk_create(batch, batch_size=1000)
+                created = size
+
+                keywords = [_random_word(2) for _ in range(options['queries'])]
+                like_p50, like_p95 = self._measure(like, keywords, options['limit'])
+                line = f"공연 {size:>7}개: icontains p50={like_p50:.1f}ms p95={like_p95:.1f}ms"
+                if use_fulltext(keywords[0]):
+                    ft_p50, ft_p95 = self._measure(fulltext, keywords, options['limit'])
+                    line += f" / fulltext p50={ft_p50:.1f}ms p95={ft_p95:.1f}ms"
+                self.stdout.write(line)
+
+            if not use_fulltext('가나'):
+                self.stdout.write(self.style.WARNING("MySQL 이 아니라서 FULLTEXT 검색은 측정하지 않았습니다."))
+        finally:
+            if not options['keep']:
+                Event.objects.filter(location=location).delete()
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from events.streams import publish_seat_changes
+
+
+class Command(BaseCommand):
+    help = "좌석 스트림(SSE)에 구독자를 동시에 붙이고, 테스트 메시지를 발행해 전달 지연과 유실을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('zone_id', type=int, help='구독할 존 ID')
+        parser.add_argument('--url', default='http://localhost:8001', help='스트림 서버 주소 (ASGI)')
+        parser.add_argument('--token', required=True, help='JWT access token')
+        parser.add_argument('--subscribers', type=int, default=500, help='동시 구독자 수')
+        parser.add_argument('--messages', type=int, default=20, help='발행할 테스트 메시지 수')
+        parser.add_argument('--interval', type=float, default=0.5, help='메시지 발행 간격(초)')
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options))
+
+    async def _run(self, options):
+        url = f"{options['url'].rstrip('/')}/api/v1/events/{options['zone_id']}/seats/stream/"
+        subscribers = options['subscribers']
+        connected = asyncio.Event()
+        ready = []
+        latencies = []
+        received = [0] * subscribers
+
+        async def subscriber(index, client):
+            async with client.stream('GET', url, params={'token': options['token']}) as response:
+                if response.status_code != 200:
+                    raise CommandError(f"스트림 연결 실패: HTTP {response.status_code}")
+                ready.append(index)
+                if len(ready) == subscribers:
+                    connected.set()
+                async for line in response.aiter_lines():
+                    if not line.startswith('data: '):
+                        continue
+                    message = json.loads(line[len('data: '):])
+                    latencies.append(time.time() - message['ts'])
+                    received[index] += 1
+
+        limits = httpx.Limits(max_connections=subscribers, max_keepalive_connections=subscribers)
+        async with httpx.AsyncClient(timeout=httpx.Timeout(None, connect=10), limits=limits) as client:
+            started = time.perf_counter()
+            tasks = [asyncio.create_task(subscriber(index, client)) for index in range(subscribers)]
+            try:
+                await asyncio.wait_for(connected.wait(), timeout=60)
+            except asyncio.TimeoutError:
+                self.stderr.write(self.style.WARNING(f"60초 안에 {len(ready)}/{subscribers} 구독자만 연결됨"))
+            self.stdout.write(f"구독자 {len(ready)}명 연결 ({time.perf_counter() - started:.2f}s)")
+
+            # 실제 좌석 상태를 건드리지 않도록 빈 변경분만 발행 (좌석 스트림은 ts 로 지연시간 측정)
+            for _ in range(options['messages']):
+                await asyncio.to_thread(publish_seat_changes, options['zone_id'], [])
+                await asyncio.sleep(options['interval'])
+            await asyncio.sleep(2)
+
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        latencies.sort()
+        expected = len(ready) * options['messages']
+        self.stdout.write(f"수신 {len(latencies)}/{expected}건")
+        if latencies:
+            total = len(latencies)
+            self.stdout.write(
+                f"전달 지연 p50={latencies[total // 2] * 1000:.1f}ms "
+                f"p95={latencies[max(int(total * 0.95) - 1, 0)] * 1000:.1f}ms "
+                f"max={latencies[-1] * 1000:.1f}ms"
+            )
+        missing = sum(1 for index in ready if received[index] < options['messages'])
+        if missing:
+            self.stderr.write(self.style.ERROR(f"메시지를 다 받지 못한 구독자 {missing}명"))
+        else:
+            self.stdout.write(self.style.SUCCESS("모든 구독자가 전체 메시지를 수신"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from events import waiting_room
+
+
+class Command(BaseCommand):
+    help = "공연별 예매 대기열의 입장 속도를 조회/변경하거나 대기열을 초기화합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', type=int)
+        parser.add_argument('--rate', type=float, help='초당 입장 인원')
+        parser.add_argument('--burst', type=int, help='오픈 즉시 입장시키는 인원')
+        parser.add_argument('--reset', action='store_true', help='대기열과 발급된 토큰을 모두 삭제')
+
+    def handle(self, *args, **options):
+        event_id = options['event_id']
+        if options['reset']:
+            deleted = waiting_room.reset(event_id)
+            self.stdout.write(self.style.SUCCESS(f"대기열 초기화 완료 (토큰 {deleted}개 삭제)"))
+        room = waiting_room.configure(event_id, rate=options['rate'], burst=options['burst'])
+        if not room:
+            self.stdout.write("대기열이 아직 열리지 않았습니다.")
+            return
+        self.stdout.write(
+            f"rate={room.get('rate')} burst={room.get('burst')} "
+            f"opened_at={room.get('opened_at', '-')} 발급 순번={room.get('seq', 0)}"
+        )
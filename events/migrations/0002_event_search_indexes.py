@@ -0,0 +1,39 @@
+# Generated manually for events app
+
+from django.db import migrations, models
+
+FULLTEXT_INDEX = 'event_name_artist_ft'
+
+
+def add_fulltext_index(apps, schema_editor):
+    # MySQL 에서만 ngram 파서 FULLTEXT 인덱스 생성 (한글은 공백 단위 토큰화로는 부분 검색이 안 됨)
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        f'ALTER TABLE event ADD FULLTEXT INDEX {FULLTEXT_INDEX} (name, artist) WITH PARSER ngram'
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(f'ALTER TABLE event DROP INDEX {FULLTEXT_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['name'], name='event_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['artist'], name='event_artist_idx'),
+        ),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated manually for events app
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_deleted', 'genre', 'created_at'], name='event_genre_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_deleted', 'created_at'], name='event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_deleted', 'view_count'], name='event_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventtime',
+            index=models.Index(fields=['event', 'event_date'], name='event_time_event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seat',
+            index=models.Index(fields=['zone', 'seat_status'], name='seat_zone_status_idx'),
+        ),
+    ]
@@ -19,6 +19,15 @@ class Event(models.Model):
 
     class Meta:
         db_table = 'event'  
+        indexes = [
+            # 자동완성: name/artist LIKE 'kw%' (검색용 FULLTEXT 인덱스는 마이그레이션 0002 에서 MySQL 에만 생성)
+            models.Index(fields=['name'], name='event_name_idx'),
+            models.Index(fields=['artist'], name='event_artist_idx'),
+            # 목록: is_deleted=False [AND genre=?] ORDER BY created_at / view_count
+            models.Index(fields=['is_deleted', 'genre', 'created_at'], name='event_genre_created_idx'),
+            models.Index(fields=['is_deleted', 'created_at'], name='event_created_idx'),
+            models.Index(fields=['is_deleted', 'view_count'], name='event_popular_idx'),
+        ]
 
 
 class EventTime(models.Model):
@@ -32,6 +41,10 @@ class EventTime(models.Model):
 
     class Meta:
         db_table = 'event_time'  
+        indexes = [
+            # 공연별 일정 정렬 / 첫 공연일 서브쿼리
+            models.Index(fields=['event', 'event_date'], name='event_time_event_date_idx'),
+        ]
 
 
 class Zone(models.Model):
@@ -57,4 +70,8 @@ class Seat(models.Model):
     is_deleted = models.BooleanField(default=False)
 
     class Meta:
-        db_table = 'seat'  
\ No newline at end of file
+        db_table = 'seat'  
+        indexes = [
+            # 존별 좌석 상태 조회 / 잔여석 재계산
+            models.Index(fields=['zone', 'seat_status'], name='seat_zone_status_idx'),
+        ]
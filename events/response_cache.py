@@ -0,0 +1,92 @@
+"""
+공연 상세/목록 응답 캐시 (Django 캐시 = Redis)
+
+키에 버전 번호를 넣어두고, 공연 정보가 바뀌면 버전만 올려서 이전 캐시를 한꺼번에 버린다 (cache_versions 참고).
+  event_detail:<event_id>:v<공연 버전>
+  event_list:v<목록 버전>:<쿼리 파라미터 해시>
+- Event / EventTime / Zone 저장·삭제 시 signals 에서 bump_event_version() 호출
+- 조회수 flush 후에도 반영된 공연의 버전을 올려 view_count 가 뒤로 가지 않게 함
+"""
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from prometheus_client import Counter
+
+from .cache_versions import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+LIST_VERSION_KEY = 'event_list:version'
+
+# 앱 로딩(signals) 경로에서 import 되므로 ticket_backend.metrics 대신 여기서 정의 (streams.py 와 같은 방식)
+event_cache_requests = Counter('event_cache_requests_total', 'Event response cache lookups', ['cache', 'result'])
+
+
+def _event_version_key(event_id):
+    return f'event_detail:{event_id}:version'
+
+
+def bump_event_version(event_ids):
+    # 트랜잭션 안이면 커밋 후에 올림 (커밋 전 데이터를 새 버전으로 캐시하지 않도록)
+    event_ids = set(event_ids)
+    if not event_ids:
+        return
+
+    def bump():
+        try:
+            for event_id in event_ids:
+                bump_version(_event_version_key(event_id))
+            bump_version(LIST_VERSION_KEY)
+        except Exception as e:
+            # 버전을 못 올려도 EVENT_CACHE_TTL 이 지나면 새 값으로 채워짐
+            logger.error(f"[EventCache] 캐시 버전 갱신 실패 {event_ids}: {e}")
+
+    transaction.on_commit(bump)
+
+
+def _lookup(name, make_key):
+    # 캐시 장애 시에는 DB 에서 바로 응답하도록 None 반환
+    try:
+        data = cache.get(make_key())
+    except Exception as e:
+        logger.error(f"[EventCache] 캐시 조회 실패: {e}")
+        event_cache_requests.labels(cache=name, result='error').inc()
+        return None
+    event_cache_requests.labels(cache=name, result='hit' if data is not None else 'miss').inc()
+    return data
+
+
+def _store(make_key, data):
+    try:
+        cache.set(make_key(), data, settings.EVENT_CACHE_TTL)
+    except Exception as e:
+        logger.error(f"[EventCache] 캐시 저장 실패: {e}")
+
+
+def detail_cache_key(event_id):
+    return f'event_detail:{event_id}:v{get_version(_event_version_key(event_id))}'
+
+
+def list_cache_key(params):
+    digest = hashlib.md5(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+    return f'event_list:v{get_version(LIST_VERSION_KEY)}:{digest}'
+
+
+def get_cached_detail(event_id):
+    return _lookup('detail', lambda: detail_cache_key(event_id))
+
+
+def set_cached_detail(event_id, data):
+    _store(lambda: detail_cache_key(event_id), data)
+
+
+def get_cached_list(params):
+    return _lookup('list', lambda: list_cache_key(params))
+
+
+def set_cached_list(params, data):
+    _store(lambda: list_cache_key(params), data)
@@ -0,0 +1,61 @@
+"""
+공연 검색
+
+- MySQL: (name, artist) ngram FULLTEXT 인덱스로 MATCH ... AGAINST 검색, 관련도(search_rank) 순 정렬
+  ngram_token_size 기본값(2)보다 짧은 검색어는 인덱스에 걸리지 않으므로 LIKE 검색으로 대체
+- 그 외 DB(로컬 SQLite 등): 기존 icontains 검색
+- 장르 패싯, 이름/아티스트 앞글자 자동완성
+"""
+from django.db import connection
+from django.db.models import Count, Q
+from django.db.models.expressions import RawSQL
+
+MIN_FULLTEXT_LENGTH = 2
+AUTOCOMPLETE_LIMIT = 10
+
+_MATCH_SQL = 'MATCH (event.name, event.artist) AGAINST (%s IN BOOLEAN MODE)'
+
+
+def use_fulltext(keyword):
+    return connection.vendor == 'mysql' and len(keyword.strip()) >= MIN_FULLTEXT_LENGTH
+
+
+def _boolean_query(keyword):
+    # 공백으로 나눈 단어를 모두 포함(+)하는 구문 검색. ngram 파서에서 "단어" 는 연속된 n-gram 으로 매칭됨
+    terms = [term.replace('"', '') for term in keyword.split()]
+    return ' '.join(f'+"{term}"' for term in terms if term)
+
+
+def search_events(queryset, keyword):
+    # 반환한 queryset 이 FULLTEXT 검색이면 search_rank 가 annotate 되어 있음
+    keyword = keyword.strip()
+    if not keyword:
+        return queryset
+    if use_fulltext(keyword):
+        query = _boolean_query(keyword)
+        return queryset.annotate(search_rank=RawSQL(_MATCH_SQL, [query])).filter(search_rank__gt=0)
+    return queryset.filter(Q(artist__icontains=keyword) | Q(name__icontains=keyword))
+
+
+def genre_facets(queryset):
+    # 장르별 결과 수 (카테고리 필터 적용 전 queryset 기준)
+    return list(
+        queryset.order_by().values('genre').annotate(count=Count('id')).order_by('-count', 'genre')
+    )
+
+
+def autocomplete(prefix, limit=AUTOCOMPLETE_LIMIT):
+    # 공연명/아티스트 앞글자 일치 (name, artist 인덱스 사용)
+    from .models import Event
+
+    prefix = prefix.strip()
+    if not prefix:
+        return []
+    queryset = Event.objects.filter(is_deleted=False)
+    names = queryset.filter(name__istartswith=prefix).order_by('-view_count').values_list('name', flat=True)[:limit]
+    artists = queryset.filter(artist__istartswith=prefix).order_by('-view_count').values_list('artist', flat=True)[:limit]
+    suggestions = []
+    for value in list(names) + list(artists):
+        if value not in suggestions:
+            suggestions.append(value)
+    return suggestions[:limit]
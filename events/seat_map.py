@@ -0,0 +1,113 @@
+"""
+존 좌석맵 캐시
+
+존 단위 정보(가격, 일정, 잔여석)는 한 번만, 좌석별 정보는 배열/상태 문자열로 압축해서
+Django 캐시(Redis)에 ETag 와 함께 저장한다. 좌석 상태가 바뀌면(예매/취소/자동취소)
+availability 모듈이 커밋 후 invalidate_seat_maps() 를 호출해 존의 캐시 버전을 올린다 (cache_versions 참고).
+  seatmap:<zone_id>:version
+  seatmap:<zone_id>:v<버전>
+"""
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_versions import bump_version, get_version
+from .models import Seat, Zone
+
+logger = logging.getLogger(__name__)
+
+# 좌석 상태 → 한 글자 코드 (seat_status 문자열의 i번째 글자가 seat_ids[i] 좌석의 상태)
+# 그 외 상태가 나오면 '0', '1', ... 순서로 코드를 붙이고 응답의 status_codes 에 함께 내려줌
+SEAT_STATUS_CODES = {
+    'available': 'A',
+    'booked': 'B',
+}
+
+
+def _version_key(zone_id):
+    return f'seatmap:{zone_id}:version'
+
+
+def _cache_key(zone_id, version):
+    return f'seatmap:{zone_id}:v{version}'
+
+
+def build_seat_map(zone_id):
+    from .availability import get_available_count
+
+    try:
+        zone = Zone.objects.select_related('event_time').get(pk=zone_id, is_deleted=False)
+    except Zone.DoesNotExist:
+        return None
+
+    status_codes = dict(SEAT_STATUS_CODES)
+    seat_ids, seat_numbers, codes = [], [], []
+    for seat_id, seat_number, seat_status in Seat.objects.filter(zone=zone).order_by('id').values_list('id', 'seat_number', 'seat_status'):
+        if seat_status not in status_codes:
+            status_codes[seat_status] = str(len(status_codes) - len(SEAT_STATUS_CODES))
+        seat_ids.append(seat_id)
+        seat_numbers.append(seat_number)
+        codes.append(status_codes[seat_status])
+
+    return {
+        'zone_id': zone.id,
+        'rank': zone.rank,
+        'price': zone.price,
+        'event_time_id': zone.event_time.id,
+        'date': zone.event_time.event_date.isoformat(),
+        'total_count': zone.total_count,
+        'available_count': get_available_count(zone),
+        'seat_ids': seat_ids,
+        'seat_numbers': seat_numbers,
+        'seat_status': ''.join(codes),
+        'status_codes': status_codes,
+    }
+
+
+def get_seat_map(zone_id):
+    # (etag, seat_map) 반환, 존이 없으면 (None, None). 캐시 장애 시에는 DB 에서 바로 만들어 돌려줌
+    try:
+        key = _cache_key(zone_id, get_version(_version_key(zone_id)))
+        cached = cache.get(key)
+    except Exception as e:
+        logger.error(f"[SeatMap] 캐시 조회 실패 zone={zone_id}: {e}")
+        key = cached = None
+    if cached is not None:
+        return cached
+
+    seat_map = build_seat_map(zone_id)
+    if seat_map is None:
+        return None, None
+    body = json.dumps(seat_map, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    etag = hashlib.md5(body).hexdigest()
+    if key is not None:
+        try:
+            cache.set(key, (etag, seat_map), settings.SEAT_MAP_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"[SeatMap] 캐시 저장 실패 zone={zone_id}: {e}")
+    return etag, seat_map
+
+
+def expand_seat_map(seat_map):
+    # 기존 응답 형식 (좌석마다 존 정보를 반복하는 dict 리스트)
+    status_names = {code: name for name, code in seat_map['status_codes'].items()}
+    return [
+        {
+            "seat_id": seat_id,
+            "seat_number": seat_number,
+            "price": seat_map['price'],
+            "seat_status": status_names[code],
+            "event_time_id": seat_map['event_time_id'],
+            "available_count": seat_map['available_count'],
+            "date": seat_map['date'],
+        }
+        for seat_id, seat_number, code in zip(seat_map['seat_ids'], seat_map['seat_numbers'], seat_map['seat_status'])
+    ]
+
+
+def invalidate_seat_maps(zone_ids):
+    for zone_id in set(zone_ids):
+        bump_version(_version_key(zone_id))
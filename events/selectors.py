@@ -0,0 +1,36 @@
+"""
+이벤트 조회용 쿼리 모음
+"""
+from django.db.models import OuterRef, Prefetch, Subquery
+
+from .models import Event, EventTime, Zone
+
+
+def with_list_summary(queryset):
+    # 목록에서 이벤트마다 따로 돌던 "첫 공연일"/"최저가" 쿼리를 상관 서브쿼리로 한 번에 계산
+    first_date = (
+        EventTime.objects
+        .filter(event=OuterRef('pk'))
+        .order_by('event_date')
+        .values('event_date')[:1]
+    )
+    min_price = (
+        Zone.objects
+        .filter(event_time__event=OuterRef('pk'))
+        .order_by('price')
+        .values('price')[:1]
+    )
+    return queryset.annotate(first_date=Subquery(first_date), min_price=Subquery(min_price))
+
+
+def event_detail_queryset():
+    # 상세 조회: event / event_time / zone 3번의 쿼리로 일정과 존을 모두 가져옴
+    # (가격 범위, 첫 공연일, zone_ids 는 EventDetailResponseSerializer 가 메모리에서 계산)
+    return Event.objects.prefetch_related(
+        Prefetch(
+            'eventtime_set',
+            queryset=EventTime.objects.order_by('event_date', 'start_time').prefetch_related(
+                Prefetch('zone_set', queryset=Zone.objects.order_by('id'))
+            ),
+        )
+    )
@@ -36,13 +36,18 @@ class EventListSerializer(serializers.ModelSerializer):
             'id', 'name', 'artist', 'location', 'date', 'thumbnail', 'price', 'status', 'view_count', 'created_at', 'genre'
         ]
 
+    # first_date / min_price 는 selectors.with_list_summary() 로 annotate 된 값 (없으면 직접 조회)
     def get_date(self, obj):
+        if hasattr(obj, 'first_date'):
+            return obj.first_date.isoformat() if obj.first_date else None
         event_time = EventTime.objects.filter(event=obj).order_by('event_date').first()
         return event_time.event_date.isoformat() if event_time else None
 
     def get_price(self, obj):
-        zones = Zone.objects.filter(event_time__event=obj)
-        return zones.order_by('price').first().price if zones.exists() else 0
+        if hasattr(obj, 'min_price'):
+            return obj.min_price if obj.min_price is not None else 0
+        zone = Zone.objects.filter(event_time__event=obj).order_by('price').first()
+        return zone.price if zone else 0
 
     def get_status(self, obj):
         return "예약가능"
@@ -66,14 +71,13 @@ class EventScheduleSerializer(serializers.Serializer):
     zone_ids = serializers.ListField(child=serializers.IntegerField(), read_only=True)
 
     def to_representation(self, instance):
-        # instance는 EventTime 인스턴스여야 함
-        from .models import Zone
+        # instance는 EventTime 인스턴스여야 함 (zone_set 을 prefetch 해두면 추가 쿼리 없음)
         data = {
             'event_time_id': instance.id,
             'date': instance.event_date.isoformat() if hasattr(instance, 'event_date') else '',
             'start_time': instance.start_time.strftime("%H:%M") if hasattr(instance, 'start_time') else '',
             'end_time': instance.end_time.strftime("%H:%M") if hasattr(instance, 'end_time') else '',
-            'zone_ids': [zone.id for zone in Zone.objects.filter(event_time=instance)]
+            'zone_ids': sorted(zone.id for zone in instance.zone_set.all())
         }
         return data
 
@@ -91,24 +95,22 @@ class EventDetailResponseSerializer(serializers.ModelSerializer):
             'description', 'schedules', 'max_reserve', 'view_count'
         ]
 
-    def get_date(self, obj):
+    # 일정/존은 selectors.event_detail_queryset() 의 prefetch 결과를 메모리에서 정렬·집계
+    # (prefetch 없이 넘어오면 eventtime_set 1번 + 일정마다 zone_set 1번 조회)
+    def _event_times(self, obj):
         if not hasattr(obj, 'eventtime_set'):
-            return None
-        first_time = obj.eventtime_set.order_by('event_date').first()
-        return first_time.event_date.isoformat() if first_time else None
+            return []
+        return sorted(obj.eventtime_set.all(), key=lambda et: (et.event_date, et.start_time))
+
+    def get_date(self, obj):
+        event_times = self._event_times(obj)
+        return event_times[0].event_date.isoformat() if event_times else None
 
     def get_schedules(self, obj):
-        if not hasattr(obj, 'eventtime_set'):
-            return []
-        event_times = obj.eventtime_set.order_by('event_date', 'start_time')
-        return EventScheduleSerializer(event_times, many=True).data
+        return EventScheduleSerializer(self._event_times(obj), many=True).data
 
     def get_price(self, obj):
-        if not hasattr(obj, 'eventtime_set'):
-            return "₩0"
-        prices = []
-        for et in obj.eventtime_set.all():
-            prices += [z.price for z in et.zone_set.all()]
+        prices = [zone.price for et in self._event_times(obj) for zone in et.zone_set.all()]
         if not prices:
             return "₩0"
         min_price = min(prices)
@@ -0,0 +1,28 @@
+"""
+공연 정보 변경 시 응답 캐시 버전 올리기 (events.response_cache)
+
+QuerySet.update() 는 시그널이 없으므로 잔여석(available_count) 갱신 같은 벌크 UPDATE 는
+캐시에 영향을 주지 않는다. (상세/목록 응답에는 잔여석이 없음)
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Event, EventTime, Zone
+from .response_cache import bump_event_version
+
+
+@receiver([post_save, post_delete], sender=Event)
+def event_changed(sender, instance, **kwargs):
+    bump_event_version([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=EventTime)
+def event_time_changed(sender, instance, **kwargs):
+    bump_event_version([instance.event_id])
+
+
+@receiver([post_save, post_delete], sender=Zone)
+def zone_changed(sender, instance, **kwargs):
+    event_id = EventTime.objects.filter(pk=instance.event_time_id).values_list('event_id', flat=True).first()
+    if event_id is not None:
+        bump_event_version([event_id])
@@ -0,0 +1,111 @@
+"""
+존별 좌석 상태 실시간 스트림 (SSE)
+
+- 예매/취소/자동취소로 좌석 상태가 바뀌면 availability 모듈이 커밋 후 publish_seat_changes() 로
+  Redis 채널(seats:zone:<zone_id>)에 변경분을 발행한다.
+- ASGI 프로세스마다 ZoneBroadcaster 하나가 seats:zone:* 를 구독하고,
+  같은 프로세스 안의 구독자(asyncio.Queue)들에게 나눠준다. (구독자 수와 무관하게 Redis 연결은 1개)
+- 클라이언트는 좌석 조회를 폴링하는 대신 처음에 좌석맵을 한 번 받고 이후 변경분만 적용한다.
+"""
+import asyncio
+import json
+import logging
+import time
+
+import redis
+from django.conf import settings
+from prometheus_client import Counter, Gauge
+
+from ticket_backend.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'seats:zone:'
+
+seat_stream_subscribers = Gauge('seat_stream_subscribers', 'Number of open seat stream connections in this process')
+seat_stream_dropped = Counter('seat_stream_dropped_messages_total', 'Seat stream messages dropped for slow subscribers')
+
+
+def _channel(zone_id):
+    return f'{CHANNEL_PREFIX}{zone_id}'
+
+
+def publish_seat_changes(zone_id, seats, available_count=None):
+    # seats: [(seat_id, seat_status), ...]. 발행 실패는 로그만 남김 (클라이언트는 재접속 시 좌석맵을 다시 받음)
+    message = json.dumps({
+        'zone_id': zone_id,
+        'seats': [{'seat_id': seat_id, 'seat_status': seat_status} for seat_id, seat_status in seats],
+        'available_count': available_count,
+        'ts': time.time(),
+    })
+    try:
+        get_redis().publish(_channel(zone_id), message)
+    except redis.RedisError as e:
+        logger.error(f"[SeatStream] 좌석 변경 발행 실패 zone={zone_id}: {e}")
+
+
+class ZoneBroadcaster:
+    def __init__(self, url=None, queue_size=None):
+        self.url = url or settings.REDIS_URL
+        self.queue_size = queue_size or settings.SEAT_STREAM_QUEUE_SIZE
+        self._subscribers = {}
+        self._task = None
+
+    def subscribe(self, zone_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(zone_id, set()).add(queue)
+        seat_stream_subscribers.inc()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, zone_id, queue):
+        queues = self._subscribers.get(zone_id)
+        if queues and queue in queues:
+            queues.discard(queue)
+            seat_stream_subscribers.dec()
+            if not queues:
+                del self._subscribers[zone_id]
+
+    def subscriber_count(self):
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _dispatch(self, zone_id, data):
+        for queue in self._subscribers.get(zone_id, ()):
+            if queue.full():
+                # 느린 구독자 때문에 메모리가 쌓이지 않도록 가장 오래된 메시지를 버림
+                queue.get_nowait()
+                seat_stream_dropped.inc()
+            queue.put_nowait(data)
+
+    async def _listen(self):
+        import redis.asyncio as aioredis
+
+        while self._subscribers:
+            client = aioredis.Redis.from_url(self.url, decode_responses=True)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f'{CHANNEL_PREFIX}*')
+                async for message in pubsub.listen():
+                    if message['type'] != 'pmessage':
+                        continue
+                    zone_id = int(message['channel'][len(CHANNEL_PREFIX):])
+                    self._dispatch(zone_id, message['data'])
+                    if not self._subscribers:
+                        break
+            except redis.RedisError as e:
+                logger.error(f"[SeatStream] Redis 구독 끊김, 재연결: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+_broadcaster = None
+
+
+def get_broadcaster():
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = ZoneBroadcaster()
+    return _broadcaster
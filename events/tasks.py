@@ -0,0 +1,22 @@
+from celery import shared_task
+
+from .availability import reconcile_available_counts
+from .view_counter import flush_view_counts
+
+
+@shared_task
+def reconcile_zone_counts():
+    # celery beat 로 주기 실행: Seat 기준으로 Zone.available_count 보정 + Redis 캐시 갱신
+    fixed = reconcile_available_counts()
+    if fixed:
+        print(f"[Celery] 잔여석 불일치 존 {fixed}개 보정")
+    return fixed
+
+
+@shared_task
+def flush_event_views():
+    # celery beat 로 주기 실행: Redis 에 쌓인 조회수를 Event.view_count 에 일괄 반영
+    flushed = flush_view_counts()
+    if flushed:
+        print(f"[Celery] 조회수 {flushed}건 반영")
+    return flushed
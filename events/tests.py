@@ -1,3 +1,157 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
 
-# Create your tests here.
+from ticket_backend.query_plan import QueryPlanTestMixin
+from tickets.models import Ticket
+from user.models import User
+from .booking import SeatsNotFound, SeatsNotInEvent, SeatsUnavailable, book_seats
+from .models import Event, EventTime, Seat, Zone
+from .selectors import event_detail_queryset
+from .serializers import EventDetailResponseSerializer
+
+
+class EventDetailQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = Event.objects.create(
+            name="detail", artist="artist", location="hall", description="",
+            genre="concert", age_rating="all", image_url=""
+        )
+        for day in range(1, 31):
+            event_time = EventTime.objects.create(
+                event=cls.event, start_time="19:00", end_time="21:00", event_date=f"2099-01-{day:02d}"
+            )
+            for price in (50000, 120000):
+                Zone.objects.create(
+                    event_time=event_time, price=price, rank="A", total_count=10, available_count=10
+                )
+
+    def test_detail_uses_fixed_number_of_queries(self):
+        # event / event_time / zone 3번 (일정 수와 무관)
+        with self.assertNumQueries(3):
+            event = event_detail_queryset().get(pk=self.event.pk, is_deleted=False)
+            data = EventDetailResponseSerializer(event).data
+
+        self.assertEqual(data['date'], '2099-01-01')
+        self.assertEqual(data['price'], "₩50,000 ~ ₩120,000")
+        self.assertEqual(len(data['schedules']), 30)
+        self.assertEqual(len(data['schedules'][0]['zone_ids']), 2)
+
+
+class BookSeatsTests(TransactionTestCase):
+    # 실제 커밋/롤백 동작을 확인해야 하므로 TransactionTestCase 사용
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="book@example.com", password="pw", name="book", phone="000")
+        self.other = User.objects.create_user(email="other@example.com", password="pw", name="other", phone="000")
+        self.event = Event.objects.create(
+            name="booking", artist="artist", location="hall", description="",
+            genre="concert", age_rating="all", image_url=""
+        )
+        event_time = EventTime.objects.create(
+            event=self.event, start_time="19:00", end_time="21:00", event_date="2099-01-01"
+        )
+        self.zone = Zone.objects.create(event_time=event_time, price=50000, rank="A", total_count=4, available_count=4)
+        Seat.objects.bulk_create([
+            Seat(zone=self.zone, seat_number=str(number), seat_status='available') for number in range(4)
+        ])
+        self.seat_ids = list(Seat.objects.filter(zone=self.zone).order_by('id').values_list('id', flat=True))
+
+    def assertBookingState(self, booked_ids, available_count):
+        statuses = dict(Seat.objects.filter(zone=self.zone).values_list('id', 'seat_status'))
+        self.assertEqual(
+            statuses,
+            {seat_id: 'booked' if seat_id in booked_ids else 'available' for seat_id in self.seat_ids}
+        )
+        self.assertEqual(sorted(Ticket.objects.values_list('seat_id', flat=True)), sorted(booked_ids))
+        self.zone.refresh_from_db()
+        self.assertEqual(self.zone.available_count, available_count)
+
+    def test_overlapping_booking_is_rejected_without_side_effects(self):
+        first = self.seat_ids[:2]
+        purchase, ticket_ids = book_seats(self.user, first, self.event.id)
+        self.assertEqual(len(ticket_ids), 2)
+        self.assertBookingState(first, 2)
+
+        # 겹치는 좌석이 하나라도 있으면 나머지 좌석도 잡지 않고 전체 롤백
+        with self.assertRaises(SeatsUnavailable) as raised:
+            book_seats(self.other, self.seat_ids[1:3], self.event.id)
+        self.assertEqual(raised.exception.seat_ids, [self.seat_ids[1]])
+        self.assertBookingState(first, 2)
+        self.assertFalse(Ticket.objects.filter(user=self.other).exists())
+
+    def test_rejects_seats_from_other_event(self):
+        other_event = Event.objects.create(
+            name="other", artist="artist", location="hall", description="",
+            genre="concert", age_rating="all", image_url=""
+        )
+        with self.assertRaises(SeatsNotInEvent) as raised:
+            book_seats(self.user, self.seat_ids[:1], other_event.id)
+        self.assertEqual(raised.exception.seat_ids, self.seat_ids[:1])
+        self.assertBookingState([], 4)
+
+    def test_rejects_missing_seats(self):
+        missing = max(self.seat_ids) + 100
+        with self.assertRaises(SeatsNotFound) as raised:
+            book_seats(self.user, [self.seat_ids[0], missing], self.event.id)
+        self.assertEqual(raised.exception.seat_ids, [missing])
+        self.assertBookingState([], 4)
+
+
+class EventQueryPlanTests(QueryPlanTestMixin, TransactionTestCase):
+    # 목록/일정/좌석 조회가 인덱스 없이 테이블 전체를 읽지 않는지 EXPLAIN 으로 확인
+
+    def setUp(self):
+        # 삭제되지 않은 공연은 10% 만 두어 인덱스가 선택되도록 함
+        Event.objects.bulk_create([
+            Event(
+                name=f"event {number}", artist=f"artist {number}", location="hall", description="",
+                genre=f"genre{number % 10}", age_rating="all", image_url="",
+                view_count=number, is_deleted=number % 10 != 0
+            )
+            for number in range(300)
+        ])
+        events = list(Event.objects.filter(is_deleted=False))
+        EventTime.objects.bulk_create([
+            EventTime(event=event, start_time="19:00", end_time="21:00", event_date=f"2099-01-{day:02d}")
+            for event in events for day in (1, 2, 3)
+        ])
+        Zone.objects.bulk_create([
+            Zone(event_time=event_time, price=price, rank="A", total_count=20, available_count=20)
+            for event_time in EventTime.objects.all() for price in (50000, 120000)
+        ])
+        Seat.objects.bulk_create([
+            Seat(zone=zone, seat_number=str(number), seat_status='available' if number % 5 else 'booked')
+            for zone in Zone.objects.all() for number in range(20)
+        ])
+        self.analyze_tables('event', 'event_time', 'zone', 'seat')
+        self.event = events[0]
+        self.zone = Zone.objects.filter(event_time__event=self.event).first()
+
+    def test_event_list_uses_index(self):
+        active = Event.objects.filter(is_deleted=False)
+        self.assertNoFullScan(active.filter(genre='genre0').order_by('-created_at')[:10], 'event')
+        # MySQL 은 is_deleted=False 를 "is_deleted = false" 로 만들어 (is_deleted, ...) 인덱스를 타지만
+        # SQLite 는 "NOT is_deleted" 로 만들어 어떤 인덱스도 쓰지 못하므로 MySQL 에서만 확인
+        if connection.vendor != 'sqlite':
+            self.assertNoFullScan(active.order_by('-created_at')[:10], 'event')
+            self.assertNoFullScan(active.order_by('-view_count')[:10], 'event')
+
+    def test_event_times_use_index(self):
+        self.assertNoFullScan(EventTime.objects.filter(event=self.event).order_by('event_date'), 'event_time')
+
+    def test_seats_use_index(self):
+        self.assertNoFullScan(Seat.objects.filter(zone=self.zone, seat_status='available'), 'seat')
+        self.assertNoFullScan(Seat.objects.filter(zone=self.zone).order_by('id'), 'seat')
+
+
+class SeatStreamTests(SimpleTestCase):
+    def test_rejects_wsgi_requests(self):
+        # WSGI 에서는 끝나지 않는 스트림이 sync 워커를 잡으므로 인증 전에 바로 거절
+        response = self.client.get(reverse('event-seats-stream', args=[1]))
+        self.assertEqual(response.status_code, 400)
+
+    async def test_asgi_request_reaches_auth(self):
+        response = await self.async_client.get(reverse('event-seats-stream', args=[1]))
+        self.assertEqual(response.status_code, 401)
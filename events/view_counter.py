@@ -0,0 +1,86 @@
+"""
+공연 조회수 버퍼
+
+상세 조회마다 event 행을 읽고-더하고-저장하면 동시 요청에서 증가분이 유실되고
+인기 공연 한 행에 락이 몰린다. 조회는 Redis 해시(event_views)에 HINCRBY 로만 쌓고,
+celery beat 가 주기적으로 모아서 증가량이 같은 공연끼리
+UPDATE event SET view_count = view_count + n WHERE id IN (...) 로 반영한다.
+(sort=popular 정렬은 DB 값 기준이라 최대 VIEW_COUNT_FLUSH_INTERVAL 초 늦게 반영됨)
+"""
+import logging
+
+import redis
+from django.db import transaction
+from django.db.models import F
+
+from ticket_backend.redis_client import get_redis
+from .models import Event
+from .response_cache import bump_event_version
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNTS_KEY = 'event_views'
+FLUSHING_KEY = 'event_views:flushing'
+# flush 가 겹치면 같은 FLUSHING_KEY 분량을 두 번 더하게 되므로 한 번에 하나만 실행 (SET NX EX)
+FLUSH_LOCK_KEY = 'event_views:flush_lock'
+FLUSH_LOCK_TIMEOUT = 60
+
+
+def record_view(event_id):
+    try:
+        get_redis().hincrby(VIEW_COUNTS_KEY, event_id, 1)
+    except redis.RedisError as e:
+        # Redis 장애 시 조회수는 DB 에 바로 반영 (원자적 UPDATE 라 유실은 없음)
+        logger.error(f"[ViewCounter] 조회수 버퍼 기록 실패 event={event_id}: {e}")
+        Event.objects.filter(pk=event_id).update(view_count=F('view_count') + 1)
+
+
+def pending_views(event_id):
+    # 아직 DB 에 반영되지 않은 조회수 (flush 진행 중인 분량 포함)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hget(VIEW_COUNTS_KEY, event_id)
+        pipe.hget(FLUSHING_KEY, event_id)
+        return sum(int(count or 0) for count in pipe.execute())
+    except redis.RedisError:
+        return 0
+
+
+def flush_view_counts():
+    client = get_redis()
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT, blocking=False)
+    if not lock.acquire():
+        logger.info("[ViewCounter] 이전 flush 가 아직 진행 중이라 건너뜀")
+        return 0
+    try:
+        return _flush(client)
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError as e:
+            # flush 가 FLUSH_LOCK_TIMEOUT 보다 오래 걸려 락이 먼저 만료된 경우
+            logger.error(f"[ViewCounter] flush 락 해제 실패: {e}")
+
+
+def _flush(client):
+    # 이전 flush 가 DB 반영 전에 실패했다면 남은 분량부터 처리하고, 아니면 현재 버퍼를 떼어냄
+    # (RENAME 이후 들어오는 조회는 새 event_views 해시에 쌓임)
+    if not client.exists(FLUSHING_KEY):
+        try:
+            client.rename(VIEW_COUNTS_KEY, FLUSHING_KEY)
+        except redis.ResponseError:
+            return 0  # 버퍼가 비어 있음
+
+    counts = client.hgetall(FLUSHING_KEY)
+    events_by_count = {}
+    for event_id, count in counts.items():
+        if int(count) > 0:
+            events_by_count.setdefault(int(count), []).append(int(event_id))
+
+    with transaction.atomic():
+        for count, event_ids in events_by_count.items():
+            Event.objects.filter(id__in=event_ids).update(view_count=F('view_count') + count)
+        # 캐시된 상세/목록의 view_count 가 반영 전 값으로 남지 않도록 버전을 올림 (커밋 후 실행)
+        bump_event_version([event_id for event_ids in events_by_count.values() for event_id in event_ids])
+    client.delete(FLUSHING_KEY)
+    return sum(count * len(event_ids) for count, event_ids in events_by_count.items())
@@ -1,17 +1,19 @@
+import asyncio
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 from .models import Seat  
-from tickets.models import Purchase, Ticket  
 from user.models import User   
-from tickets.tasks import auto_cancel_ticket
+from tickets.holds import create_holds
 
 
 from rest_framework import viewsets
-from django.db.models import Q
 from .models import Event, EventTime, Zone, Seat
 from .serializers import (
     EventListSerializer, EventListResponseSerializer,
@@ -19,8 +21,19 @@ from .serializers import (
     BuyTicketsResponseSerializer, PayTicketResponseSerializer,
     EventSerializer
 )
+from .selectors import with_list_summary, event_detail_queryset
+from .search import search_events, genre_facets, autocomplete
+from .booking import book_seats, confirm_payment, BookingError
+from .seat_map import get_seat_map, expand_seat_map
+from .streams import get_broadcaster
+from .view_counter import record_view, pending_views
+from .response_cache import get_cached_detail, set_cached_detail, get_cached_list, set_cached_list
+from . import waiting_room
+from .waiting_room import WaitingRoomError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiTypes, OpenApiExample
 
 
@@ -31,7 +44,10 @@ class BuyTicketsView(APIView):
 
     @extend_schema(
         summary="티켓 예매",
-        description="선택한 좌석(seat_id 리스트)과 공연 일정(event_time_id)로 티켓을 예매합니다.",
+        description="선택한 좌석(seat_id 리스트)과 공연 일정(event_time_id)로 티켓을 예매합니다. URL 의 공연(event_id)에 속하지 않은 좌석이 있으면 400 을 반환합니다.",
+        parameters=[
+            OpenApiParameter(name='X-Queue-Token', description='대기열 입장 토큰 (WAITING_ROOM_ENABLED 일 때 필수)', required=False, type=str, location=OpenApiParameter.HEADER),
+        ],
         request={
             'application/json': {
                 'type': 'object',
@@ -81,46 +97,20 @@ class BuyTicketsView(APIView):
         if not isinstance(seat_ids, list) or not seat_ids:
             return Response({'error': 'seat_id must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 좌석 존재 여부 확인
-        seats = Seat.objects.filter(id__in=seat_ids)
-        if seats.count() != len(seat_ids):
-            return Response({'error': 'Some seats not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-        # 이미 예약된 좌석 확인
-        unavailable_seats = [seat.id for seat in seats if seat.seat_status != 'available']
-        if unavailable_seats:
-            return Response({'error': f'이미 선택된 좌석입니다: {unavailable_seats}'}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Purchase 생성
-        purchase = Purchase.objects.create(
-            user=user,
-            purchase_status="결제 전",
-            created_at=timezone.now(),
-            updated_at=timezone.now(),
-            is_deleted=False
-        )
+        # 대기열에서 입장한 토큰만 예매 가능 (WAITING_ROOM_ENABLED 일 때)
+        try:
+            waiting_room.check_admission(request.headers.get('X-Queue-Token'), user.id, event_id)
+        except WaitingRoomError as e:
+            return Response({'error': e.message}, status=e.status_code)
 
-        # Ticket 생성
-        tickets = []
-        for seat in seats:
-            ticket = Ticket.objects.create(
-                user=user,
-                seat=seat,
-                purchase=purchase,
-                ticket_status='booked',
-                face_verified=False,
-                verified_at=None,
-                created_at=timezone.now(),
-                updated_at=timezone.now(),
-                is_deleted=False
-            )
-            seat.seat_status = 'booked'
-            seat.save()
-            tickets.append(ticket.id)
-            # 자동취소 Celery 태스크 예약
-            if ticket.ticket_status in ['booked', 'reserved']:
-                print(f"[Django] Celery 태스크 예약: {ticket.id}")
-                auto_cancel_ticket.apply_async((ticket.id,), countdown=300)
+        # 좌석 선점 + Purchase/Ticket 생성 (하나의 트랜잭션)
+        try:
+            purchase, tickets = book_seats(user, seat_ids, event_id)
+        except BookingError as e:
+            return Response({'error': e.message}, status=e.status_code)
+
+        # 좌석 홀드 생성 (SEAT_HOLD_TTL 안에 결제하지 않으면 스위퍼가 자동취소)
+        create_holds(tickets)
 
         return Response({
             'message': 'Tickets successfully created.',
@@ -136,6 +126,9 @@ class PayTicketView(APIView):
     @extend_schema(
         summary="티켓 결제",
         description="구매(purchase_id)에 대해 결제 정보를 입력하고 결제 완료 처리.",
+        parameters=[
+            OpenApiParameter(name='X-Queue-Token', description='대기열 입장 토큰 (WAITING_ROOM_ENABLED 일 때 필수)', required=False, type=str, location=OpenApiParameter.HEADER),
+        ],
         request={
             'application/json': {
                 'type': 'object',
@@ -171,6 +164,17 @@ class PayTicketView(APIView):
                     )
                 ]
             ),
+            409: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description="이미 결제됐거나 예매 유효 시간이 지난 구매",
+                examples=[
+                    OpenApiExample(
+                        "Conflict",
+                        value={"error": "이미 결제되었거나 결제할 수 없는 구매입니다."},
+                        status_codes=["409"]
+                    )
+                ]
+            ),
         },
         methods=["PATCH"]
     )
@@ -185,31 +189,84 @@ class PayTicketView(APIView):
             return Response({'error': 'name, phone, email은 모두 필수입니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            # 인증된 유저와 purchase_id로 구매 정보 조회
-            purchase = Purchase.objects.get(id=purchase_id, user=request.user, is_deleted=False)
-        except Purchase.DoesNotExist:
-            return Response({'error': '해당 구매 정보를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
-
-        # 정보 업데이트
-        purchase.purchase_status = 'completed'
-        purchase.updated_at = timezone.now()
-        purchase.purchaser = name
-        purchase.phone_number = phone
-        purchase.email = email
-        purchase.save()
-
-        updated_count = Ticket.objects.filter(purchase_id=int(purchase_id)).update(ticket_status="reserved")
-
-        # 상태변경된 티켓들에 대해 자동취소 Celery 태스크 예약
-        updated_tickets = Ticket.objects.filter(purchase_id=int(purchase_id))
-        for ticket in updated_tickets:
-            if ticket.ticket_status in ['booked', 'reserved']:
-                print(f"[Django] Celery 태스크 예약: {ticket.id}")
-                auto_cancel_ticket.apply_async((ticket.id,), countdown=300)
+            waiting_room.check_admission(request.headers.get('X-Queue-Token'), request.user.id)
+        except WaitingRoomError as e:
+            return Response({'error': e.message}, status=e.status_code)
+
+        # 구매 결제 완료 + 티켓 reserved 확정 (하나의 트랜잭션) 후 좌석 홀드 해제
+        try:
+            confirm_payment(request.user, purchase_id, name, phone, email)
+        except BookingError as e:
+            return Response({'error': e.message}, status=e.status_code)
 
         return Response({'message': '결제가 완료되었습니다.'}, status=status.HTTP_200_OK)
 
 
+@extend_schema(tags=["events"])
+class WaitingRoomJoinView(APIView):
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="예매 대기열 등록",
+        description="공연(event_id) 예매 대기열에 들어가 대기열 토큰과 순번을 발급받습니다. "
+                    "이미 등록한 유저는 기존 토큰을 그대로 돌려받습니다. "
+                    "입장(status=admitted) 후 예매/결제 요청의 X-Queue-Token 헤더로 토큰을 보냅니다.",
+        request=None,
+        responses={
+            200: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description="대기열 상태",
+                examples=[
+                    OpenApiExample(
+                        "Waiting",
+                        value={"token": "Zx3...", "event_id": 1, "user_id": 7, "position": 1520,
+                               "status": "waiting", "ahead": 1210, "estimated_wait_seconds": 121, "poll_after": 30},
+                        status_codes=["200"]
+                    )
+                ]
+            ),
+            404: OpenApiResponse(description="공연 없음"),
+            503: OpenApiResponse(description="대기열 서비스 장애"),
+        }
+    )
+    def post(self, request, event_id):
+        if not Event.objects.filter(id=event_id, is_deleted=False).exists():
+            return Response({'error': '행사를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            result = waiting_room.join(event_id, request.user.id)
+        except WaitingRoomError as e:
+            return Response({'error': e.message}, status=e.status_code)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["events"])
+class WaitingRoomStatusView(APIView):
+    # 대기 중 반복 조회되는 API 라서 DB 를 건드리지 않도록 JWT 인증 없이 토큰만으로 조회
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        summary="예매 대기열 상태 조회",
+        description="대기열 토큰의 현재 상태(waiting/admitted/expired)와 남은 인원을 반환합니다. "
+                    "waiting 이면 poll_after 초 뒤에 다시 조회합니다.",
+        responses={
+            200: OpenApiResponse(response=OpenApiTypes.OBJECT, description="대기열 상태"),
+            404: OpenApiResponse(description="다른 공연의 토큰"),
+            503: OpenApiResponse(description="대기열 서비스 장애"),
+        }
+    )
+    def get(self, request, event_id, token):
+        try:
+            result = waiting_room.queue_status(token)
+        except WaitingRoomError as e:
+            return Response({'error': e.message}, status=e.status_code)
+        if result.get('event_id', event_id) != event_id:
+            return Response({'error': '유효하지 않은 대기열 토큰입니다.'}, status=status.HTTP_404_NOT_FOUND)
+        result.pop('user_id', None)
+        return Response(result, status=status.HTTP_200_OK)
+
+
 @extend_schema(tags=["events"])
 class EventViewSet(viewsets.ModelViewSet):
     queryset = Event.objects.all()
@@ -222,7 +279,8 @@ class EventListAPIView(APIView):
         parameters=[
             OpenApiParameter(name='keyword', description='검색어', required=False, type=str, location=OpenApiParameter.QUERY),
             OpenApiParameter(name='category', description='카테고리', required=False, type=str, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='sort', description='정렬(popular/new)', required=False, type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='sort', description='정렬(popular/new/relevance, 검색어가 있으면 기본 relevance)', required=False, type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='facets', description='true 이면 장르별 결과 수(facets)를 함께 반환', required=False, type=bool, location=OpenApiParameter.QUERY),
             OpenApiParameter(name='page', description='페이지 번호', required=False, type=int, location=OpenApiParameter.QUERY),
             OpenApiParameter(name='limit', description='페이지당 개수', required=False, type=int, location=OpenApiParameter.QUERY),
         ],
@@ -261,13 +319,19 @@ class EventListAPIView(APIView):
             limit = int(request.GET.get('limit', 10))
             offset = (page - 1) * limit
 
+            with_facets = request.GET.get('facets', '').lower() in ('1', 'true')
+
+            cache_params = {'keyword': keyword, 'category': category, 'sort': sort, 'page': page, 'limit': limit, 'facets': with_facets}
+            cached = get_cached_list(cache_params)
+            if cached is not None:
+                return Response(cached, status=status.HTTP_200_OK)
+
             queryset = Event.objects.filter(is_deleted=False)
 
-            if keyword:
-                queryset = queryset.filter(
-                    Q(artist__icontains=keyword) |
-                    Q(name__icontains=keyword)
-                )
+            # MySQL 은 FULLTEXT(ngram) 검색 + 관련도 점수, 그 외에는 icontains (events.search)
+            queryset = search_events(queryset, keyword)
+            ranked = 'search_rank' in queryset.query.annotations
+            facets = genre_facets(queryset) if with_facets else None
             if category:
                 queryset = queryset.filter(genre=category)
 
@@ -275,28 +339,34 @@ class EventListAPIView(APIView):
                 queryset = queryset.order_by('-view_count')
             elif sort == 'new':
                 queryset = queryset.order_by('-created_at')
+            elif ranked:
+                queryset = queryset.order_by('-search_rank', '-created_at')
             else:
                 queryset = queryset.order_by('-created_at')
 
             total_count = queryset.count()
-            events = queryset[offset:offset+limit]
+            events = with_list_summary(queryset)[offset:offset+limit]
             serializer = EventListSerializer(events, many=True)
 
             if total_count == 0:
-                return Response({
+                data = {
                     "page": page,
                     "limit": limit,
                     "totalCount": 0,
                     "events": [],
                     "message": "검색 결과가 없습니다."
-                }, status=status.HTTP_200_OK)
-
-            return Response({
-                "page": page,
-                "limit": limit,
-                "totalCount": total_count,
-                "events": serializer.data
-            }, status=status.HTTP_200_OK)
+                }
+            else:
+                data = {
+                    "page": page,
+                    "limit": limit,
+                    "totalCount": total_count,
+                    "events": serializer.data
+                }
+            if facets is not None:
+                data["facets"] = facets
+            set_cached_list(cache_params, data)
+            return Response(data, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({
                 "message": "서버 내부 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
@@ -327,14 +397,43 @@ class EventDetailAPIView(APIView):
     )
     def get(self, request, event_id):
         try:
-            event = Event.objects.get(pk=event_id, is_deleted=False)
-            event.view_count += 1
-            event.save(update_fields=["view_count"])
-            serializer = EventDetailResponseSerializer(event)
-            return Response(serializer.data)
+            data = get_cached_detail(event_id)
+            if data is None:
+                event = event_detail_queryset().get(pk=event_id, is_deleted=False)
+                data = EventDetailResponseSerializer(event).data
+                set_cached_detail(event_id, data)
+            # 조회수는 Redis 에 쌓았다가 주기적으로 일괄 반영 (events.view_counter)
+            record_view(event_id)
+            data = {**data, 'view_count': data['view_count'] + pending_views(event_id)}
+            return Response(data)
         except Event.DoesNotExist:
             return Response({"message": "행사를 찾을 수 없습니다."}, status=404)
 
+@extend_schema(tags=["events"])
+class EventAutocompleteAPIView(APIView):
+    @extend_schema(
+        summary="공연 검색어 자동완성",
+        description="공연명/아티스트가 q 로 시작하는 항목을 조회수 순으로 최대 10개 반환.",
+        parameters=[
+            OpenApiParameter(name='q', description='입력 중인 검색어', required=True, type=str, location=OpenApiParameter.QUERY),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description="자동완성 목록",
+                examples=[
+                    OpenApiExample(
+                        "Suggestions",
+                        value={"suggestions": ["아이유 콘서트", "아이유"]},
+                        status_codes=["200"]
+                    )
+                ]
+            ),
+        }
+    )
+    def get(self, request):
+        return Response({"suggestions": autocomplete(request.GET.get('q', ''))}, status=status.HTTP_200_OK)
+
 @extend_schema(tags=["events"])        
 class EventSeatsAPIView(APIView):
     authentication_classes = [JWTAuthentication]
@@ -342,12 +441,17 @@ class EventSeatsAPIView(APIView):
 
     @extend_schema(
         summary="존별 좌석 정보 조회",
-        description="특정 존(zone_id)의 좌석 정보와 잔여 좌석 수를 반환.",
+        description="특정 존(zone_id)의 좌석 정보와 잔여 좌석 수를 반환. "
+                    "compact=true 이면 존 정보는 한 번만, 좌석은 seat_ids/seat_numbers 배열과 "
+                    "seat_status 상태 문자열(status_codes 참고)로 압축해서 반환. "
+                    "ETag 를 내려주며 If-None-Match 가 같으면 304 를 반환.",
         parameters=[
             OpenApiParameter(name='zone_id', description='존 ID', required=True, type=int, location=OpenApiParameter.PATH),
+            OpenApiParameter(name='compact', description='압축 좌석맵 형식 사용 여부', required=False, type=bool, location=OpenApiParameter.QUERY),
         ],
         responses={
             200: EventSeatsResponseSerializer,
+            304: OpenApiResponse(description="좌석맵 변경 없음 (If-None-Match 일치)"),
             404: OpenApiResponse(
                 response=OpenApiTypes.OBJECT,
                 description="존 없음",
@@ -362,28 +466,62 @@ class EventSeatsAPIView(APIView):
         }
     )
     def get(self, request, zone_id):
-        try:
-            zone = Zone.objects.get(pk=zone_id, is_deleted=False)
-            seats = Seat.objects.filter(zone=zone)
-            seats_data = []
-            for seat in seats:
-                seats_data.append({
-                    "seat_id": seat.id,
-                    "seat_number": seat.seat_number,
-                    "price": zone.price,
-                    "seat_status": seat.seat_status,
-                    "event_time_id": zone.event_time.id,
-                    "available_count": zone.available_count,  # 잔여좌석
-                    "date": zone.event_time.event_date.isoformat(),
-                })
-            return Response({
-                "statusCode": 200,
-                "message": "좌석 정보를 성공적으로 불러왔습니다.",
-                "data": seats_data
-            }, status=status.HTTP_200_OK)
-        except Zone.DoesNotExist:
+        etag, seat_map = get_seat_map(zone_id)
+        if seat_map is None:
             return Response({
                 "statusCode": 404,
                 "message": "해당 존의 좌석 정보를 찾을 수 없습니다.",
                 "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        compact = request.GET.get('compact', '').lower() in ('1', 'true')
+        etag = f'"{etag}-{"c" if compact else "l"}"'
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in request.headers.get('If-None-Match', ''):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response({
+            "statusCode": 200,
+            "message": "좌석 정보를 성공적으로 불러왔습니다.",
+            "data": seat_map if compact else expand_seat_map(seat_map)
+        }, status=status.HTTP_200_OK, headers=headers)
+
+
+async def zone_seat_stream(request, zone_id):
+    # 좌석 변경 실시간 스트림 (text/event-stream)
+    # EventSource 는 헤더를 못 붙이므로 Authorization 헤더 대신 ?token=<access token> 도 허용
+    # WSGI 에서는 StreamingHttpResponse 가 비동기 이터레이터를 끝까지 모은 뒤 보내므로
+    # 끝나지 않는 스트림이 sync 워커 하나를 타임아웃까지 잡고 메모리를 계속 늘림 → ASGI 요청만 받음
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"statusCode": 400, "message": "좌석 스트림은 ASGI 서버(stream 서비스)에서만 제공됩니다.", "data": None},
+            status=400
+        )
+    raw_token = request.GET.get('token') or request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    try:
+        AccessToken(raw_token)
+    except TokenError:
+        return JsonResponse({"statusCode": 401, "message": "유효한 토큰이 필요합니다.", "data": None}, status=401)
+
+    broadcaster = get_broadcaster()
+    heartbeat = settings.SEAT_STREAM_HEARTBEAT
+
+    async def events():
+        queue = broadcaster.subscribe(zone_id)
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    # 프록시 유휴 타임아웃으로 연결이 끊기지 않도록 주석 라인 전송
+                    yield ': ping\n\n'
+                    continue
+                yield f'event: seats\ndata: {data}\n\n'
+        finally:
+            broadcaster.unsubscribe(zone_id, queue)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,198 @@
+"""
+예매 대기열 (Redis)
+
+- 대기열에 들어오면 토큰과 순번(position)을 발급한다. 같은 유저가 다시 들어오면 기존 토큰을 돌려준다.
+- 입장은 공연별 속도(rate, 초당 입장 인원)로 계산한다.
+    입장 가능 순번 = burst + (현재 시각 - 대기열 오픈 시각) * rate
+  별도의 입장 처리 워커 없이 상태 조회 때마다 계산하므로 조회는 Redis 읽기 두 번이면 끝난다.
+- 입장한 토큰은 입장 시각부터 WAITING_ROOM_ADMISSION_TTL 초 동안만 예매/결제에 쓸 수 있다.
+  (동시에 예매 흐름에 있는 인원이 대략 rate * ADMISSION_TTL 로 제한됨)
+
+키 (Redis Cluster 에서 한 스크립트로 다룰 수 있도록 공연 ID 를 해시 태그로 묶음, 토큰은 "<event_id>.<랜덤>")
+  waiting_room:{<event_id>}                  hash  opened_at, rate, burst, seq
+  waiting_room:{<event_id>}:user:<id>        str   유저의 토큰
+  waiting_room:{<event_id>}:token:<token>    hash  event_id, user_id, position
+"""
+import logging
+import math
+import secrets
+import time
+
+import redis
+from django.conf import settings
+
+from ticket_backend.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# 유저당 토큰 하나만 발급되도록 순번 증가와 토큰 저장을 원자적으로 처리
+# 기존 토큰 키도 KEYS 로 받아야 하므로 호출 전에 읽은 기존 토큰(ARGV[8])과 다르면 nil 을 돌려 다시 시도하게 함
+_JOIN_SCRIPT = """
+local existing = redis.call('GET', KEYS[2])
+if (existing or '') ~= ARGV[8] then
+    return nil
+end
+if existing and redis.call('EXISTS', KEYS[4]) == 1 then
+    return existing
+end
+redis.call('HSETNX', KEYS[1], 'opened_at', ARGV[2])
+redis.call('HSETNX', KEYS[1], 'rate', ARGV[3])
+redis.call('HSETNX', KEYS[1], 'burst', ARGV[4])
+local position = redis.call('HINCRBY', KEYS[1], 'seq', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[5])
+redis.call('HSET', KEYS[3], 'event_id', ARGV[6], 'user_id', ARGV[7], 'position', position)
+redis.call('EXPIRE', KEYS[3], ARGV[5])
+return ARGV[1]
+"""
+
+
+class WaitingRoomError(Exception):
+    status_code = 403
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.message = message
+        if status_code is not None:
+            self.status_code = status_code
+
+
+# 기존 토큰을 읽은 뒤 스크립트 실행 전에 다른 요청이 토큰을 바꾼 경우 다시 시도하는 횟수
+_JOIN_ATTEMPTS = 3
+
+
+def _room_key(event_id):
+    return f'waiting_room:{{{event_id}}}'
+
+
+def _user_key(event_id, user_id):
+    return f'waiting_room:{{{event_id}}}:user:{user_id}'
+
+
+def _token_key(token):
+    # 토큰 앞부분의 공연 ID 로 같은 해시 슬롯에 둠. 형식이 다르면 None
+    event_id, _, _ = token.partition('.')
+    if not event_id.isdigit():
+        return None
+    return f'waiting_room:{{{event_id}}}:token:{token}'
+
+
+def join(event_id, user_id):
+    # 반환: 토큰 상태 dict (queue_status 와 같은 형식)
+    token = f'{event_id}.{secrets.token_urlsafe(24)}'
+    client = get_redis()
+    try:
+        for _ in range(_JOIN_ATTEMPTS):
+            existing = client.get(_user_key(event_id, user_id)) or ''
+            issued = client.eval(
+                _JOIN_SCRIPT, 4,
+                _room_key(event_id), _user_key(event_id, user_id), _token_key(token),
+                _token_key(existing) or _token_key(token),
+                token, time.time(), settings.WAITING_ROOM_ADMIT_RATE, settings.WAITING_ROOM_ADMIT_BURST,
+                settings.WAITING_ROOM_TOKEN_TTL, event_id, user_id, existing,
+            )
+            if issued:
+                return queue_status(issued)
+    except redis.RedisError as e:
+        logger.error(f"[WaitingRoom] 대기열 등록 실패 event={event_id}: {e}")
+        raise WaitingRoomError('대기열 서비스를 사용할 수 없습니다.', 503)
+    logger.error(f"[WaitingRoom] 대기열 등록 경합으로 실패 event={event_id} user={user_id}")
+    raise WaitingRoomError('대기열 등록이 몰리고 있습니다. 잠시 후 다시 시도해 주세요.', 503)
+
+
+def _load(token):
+    token_key = _token_key(token)
+    if token_key is None:
+        return None, None
+    ticket = get_redis().hgetall(token_key)
+    if not ticket:
+        return None, None
+    room = get_redis().hgetall(_room_key(ticket['event_id']))
+    if not room:
+        return None, None
+    return ticket, room
+
+
+def queue_status(token, now=None):
+    now = now or time.time()
+    try:
+        ticket, room = _load(token)
+    except redis.RedisError as e:
+        logger.error(f"[WaitingRoom] 대기열 조회 실패: {e}")
+        raise WaitingRoomError('대기열 서비스를 사용할 수 없습니다.', 503)
+    if ticket is None:
+        return {'token': token, 'status': 'expired'}
+
+    position = int(ticket['position'])
+    opened_at = float(room['opened_at'])
+    rate = float(room['rate'])
+    burst = int(room['burst'])
+    admitted_upto = burst + math.floor(max(now - opened_at, 0) * rate)
+
+    result = {
+        'token': token,
+        'event_id': int(ticket['event_id']),
+        'user_id': int(ticket['user_id']),
+        'position': position,
+    }
+    if position > admitted_upto:
+        ahead = position - admitted_upto
+        wait = ahead / rate if rate > 0 else None
+        result.update({
+            'status': 'waiting',
+            'ahead': ahead,
+            'estimated_wait_seconds': math.ceil(wait) if wait is not None else None,
+            # 앞 사람이 많을수록 드물게 조회하도록 안내
+            'poll_after': min(max(math.ceil((wait or 60) / 2), 2), 30),
+        })
+        return result
+
+    admitted_at = opened_at + (max(position - burst, 0) / rate if rate > 0 else 0)
+    expires_in = math.floor(admitted_at + settings.WAITING_ROOM_ADMISSION_TTL - now)
+    if expires_in <= 0:
+        result['status'] = 'expired'
+    else:
+        result.update({'status': 'admitted', 'expires_in': expires_in})
+    return result
+
+
+def check_admission(token, user_id, event_id=None):
+    # 예매/결제 전 호출. 입장한 본인 토큰이 아니면 WaitingRoomError
+    if not settings.WAITING_ROOM_ENABLED:
+        return
+    if not token:
+        raise WaitingRoomError('대기열 토큰(X-Queue-Token)이 필요합니다.', 428)
+    result = queue_status(token)
+    if result['status'] == 'expired':
+        raise WaitingRoomError('대기열 토큰이 만료되었습니다. 다시 대기열에 들어와 주세요.')
+    if result['user_id'] != user_id or (event_id is not None and result['event_id'] != int(event_id)):
+        raise WaitingRoomError('유효하지 않은 대기열 토큰입니다.')
+    if result['status'] != 'admitted':
+        raise WaitingRoomError(f"아직 입장 순서가 아닙니다. (남은 인원 {result['ahead']}명)", 429)
+
+
+def configure(event_id, rate=None, burst=None):
+    # 공연별 입장 속도 조정. 오픈 전에 설정해 두면 첫 등록 때 기본값으로 덮이지 않음
+    # (진행 중에 바꾸면 입장 가능 순번이 오픈 시각부터 새 속도로 다시 계산됨)
+    fields = {}
+    if rate is not None:
+        fields['rate'] = rate
+    if burst is not None:
+        fields['burst'] = burst
+    if fields:
+        get_redis().hset(_room_key(event_id), mapping=fields)
+    return get_redis().hgetall(_room_key(event_id))
+
+
+def reset(event_id):
+    # 대기열 초기화 (발급된 토큰 모두 무효화)
+    client = get_redis()
+    deleted = 0
+    for user_key in client.scan_iter(match=f'{_user_key(event_id, "*")}', count=1000):
+        token = client.get(user_key)
+        if token and _token_key(token):
+            client.delete(_token_key(token))
+        client.delete(user_key)
+        deleted += 1
+    client.delete(_room_key(event_id))
+    return deleted
@@ -1,4 +1,5 @@
-from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
 from django.http import HttpResponse
 
 # 커스텀 메트릭 예시: 얼굴인식 실패 카운터
@@ -7,6 +8,48 @@ face_recognition_failures = Counter('face_recognition_failures_total', 'Count of
 # 임의 메트릭: 현재 활성 사용자 수 (Gauge)
 active_users = Gauge('active_users', 'Number of active users')
 
+
+class ExpiredTicketSweeperCollector:
+    # 만료 티켓 스위퍼는 celery 워커에서 돌기 때문에 실행 통계를 Redis 에 남기고, 스크랩 시점에 읽어서 노출
+    # describe() 가 있어야 REGISTRY.register() 가 등록 시점에 collect() 를 호출하지 않음
+    # (등록 중에는 레지스트리 락을 잡고 있어서 collect() 안에서 다른 메트릭이 생성되면 교착 상태가 됨)
+    def describe(self):
+        return self._families({})
+
+    def collect(self):
+        import redis
+        from tickets.constants import SWEEPER_METRICS_KEY
+        from ticket_backend.redis_client import get_redis
+
+        try:
+            stats = get_redis().hgetall(SWEEPER_METRICS_KEY)
+        except redis.RedisError:
+            return []
+        return self._families(stats)
+
+    def _families(self, stats):
+        return [
+            CounterMetricFamily(
+                'expired_ticket_sweeper_runs', 'Number of expired ticket sweeper runs',
+                value=float(stats.get('runs_total', 0))),
+            CounterMetricFamily(
+                'expired_ticket_sweeper_canceled', 'Number of tickets canceled by the expired ticket sweeper',
+                value=float(stats.get('canceled_total', 0))),
+            CounterMetricFamily(
+                'expired_ticket_sweeper_duration_seconds', 'Total time spent in expired ticket sweeper runs',
+                value=float(stats.get('duration_seconds_total', 0))),
+            GaugeMetricFamily(
+                'expired_ticket_sweeper_last_canceled', 'Tickets canceled by the last sweeper run',
+                value=float(stats.get('last_canceled', 0))),
+            GaugeMetricFamily(
+                'expired_ticket_sweeper_last_duration_seconds', 'Duration of the last sweeper run',
+                value=float(stats.get('last_duration_seconds', 0))),
+        ]
+
+
+REGISTRY.register(ExpiredTicketSweeperCollector())
+
+
 def metrics_view(request):
     # 여기서 generate_latest()가 모든 메트릭을 프로메테우스 형식으로 인코딩해서 반환
     metrics_page = generate_latest()
@@ -0,0 +1,47 @@
+"""
+쿼리 실행 계획 확인 (인덱스 회귀 테스트용)
+
+full_scans(queryset, table) 은 queryset 을 EXPLAIN 해서 table 을 인덱스 없이 전체 스캔하는 단계를 돌려준다.
+- MySQL: EXPLAIN 결과에서 해당 테이블의 type 이 ALL 인 행
+- SQLite: EXPLAIN QUERY PLAN 결과에서 "SCAN <table>" (인덱스를 타는 "SCAN <table> USING ... INDEX" 는 제외)
+테스트에서는 QueryPlanTestMixin 의 analyze_tables() / assertNoFullScan() 을 사용한다.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def explain(queryset):
+    connection = connections[queryset.db]
+    sql, params = queryset.query.sql_with_params()
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def full_scans(queryset, table):
+    vendor = connections[queryset.db].vendor
+    plan = explain(queryset)
+    if vendor == 'mysql':
+        return [row for row in plan if row.get('table') == table and row.get('type') == 'ALL']
+    if vendor == 'sqlite':
+        return [
+            row for row in plan
+            if row['detail'] in (f'SCAN {table}', f'SCAN TABLE {table}')
+        ]
+    raise NotImplementedError(f'{vendor} 실행 계획은 지원하지 않습니다.')
+
+
+class QueryPlanTestMixin:
+    # TransactionTestCase 와 함께 사용 (MySQL ANALYZE TABLE 은 암묵적 커밋을 일으키므로 TestCase 트랜잭션 안에서 못 씀)
+
+    def analyze_tables(self, *tables, using=DEFAULT_DB_ALIAS):
+        # 테스트 데이터를 넣은 직후에는 MySQL 통계가 비어 있어 작은 테이블로 보고 전체 스캔을 고를 수 있음
+        connection = connections[using]
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE TABLE ' + ', '.join(connection.ops.quote_name(table) for table in tables))
+
+    def assertNoFullScan(self, queryset, table):
+        scans = full_scans(queryset, table)
+        self.assertFalse(scans, f"{table} 전체 스캔: {scans}\n{queryset.query}")
@@ -0,0 +1,17 @@
+"""
+애플리케이션 공용 Redis 클라이언트 (좌석 홀드, 카운터, 대기열 등)
+
+Celery 브로커와 같은 Redis 서버를 쓰되 DB 번호는 REDIS_URL 로 분리한다.
+redis-py 커넥션 풀은 스레드 안전하고 fork 이후 pid 가 바뀌면 스스로 재연결한다.
+"""
+import redis
+from django.conf import settings
+
+_client = None
+
+
+def get_redis():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
@@ -20,6 +20,71 @@ ALLOWED_HOSTS = ["*"]  # 개발 시는 * 허용 / 배포 시 도메인 지정
 CELERY_BROKER_URL = 'redis://redis:6379/0'
 CELERY_RESULT_BACKEND = 'redis://redis:6379/0'
 
+# 애플리케이션 데이터용 Redis (좌석 홀드 등, ticket_backend/redis_client.py)
+REDIS_URL = os.environ.get("REDIS_URL", "redis://redis:6379/1")
+
+# Django 캐시 (좌석맵 등 응답 캐시)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get("CACHE_REDIS_URL", "redis://redis:6379/2"),
+    }
+}
+# 좌석맵은 좌석 상태 변경 시 바로 무효화되고, TTL 은 혹시 놓친 무효화에 대한 안전장치
+SEAT_MAP_CACHE_TTL = int(os.environ.get("SEAT_MAP_CACHE_TTL", "60"))
+# 티켓 QR 체크인 토큰 서명 키 (Ed25519 개인키, base64). 스캐너에는 공개키만 배포 (manage.py checkin_public_key)
+# SECRET_KEY(JWT 서명)로 대체하지 않음 — 없으면 시스템 체크 tickets.E001 오류 (README 참고)
+QR_SIGNING_KEY = os.environ.get("QR_SIGNING_KEY")
+QR_TOKEN_GRACE = int(os.environ.get("QR_TOKEN_GRACE", str(60 * 60 * 6)))  # 공연 종료 후 유효 시간(초)
+# 티켓 QR 이미지 캐시 (내용 해시 키라서 길게 보관)
+QR_CACHE_TTL = int(os.environ.get("QR_CACHE_TTL", str(60 * 60 * 24 * 30)))
+# 공연 상세/목록 응답 캐시 (변경 시 시그널로 버전이 올라가므로 TTL 은 안전망)
+EVENT_CACHE_TTL = int(os.environ.get("EVENT_CACHE_TTL", "300"))
+
+# 좌석 실시간 스트림 (SSE): 하트비트 간격(초), 구독자별 대기 메시지 수 상한
+SEAT_STREAM_HEARTBEAT = int(os.environ.get("SEAT_STREAM_HEARTBEAT", "15"))
+SEAT_STREAM_QUEUE_SIZE = int(os.environ.get("SEAT_STREAM_QUEUE_SIZE", "100"))
+
+# 좌석 홀드: 예매 후 SEAT_HOLD_TTL 초 안에 결제하지 않으면 스위퍼가 자동 취소 (결제 시 홀드 해제)
+SEAT_HOLD_TTL = int(os.environ.get("SEAT_HOLD_TTL", "300"))
+SEAT_HOLD_SWEEP_INTERVAL = float(os.environ.get("SEAT_HOLD_SWEEP_INTERVAL", "15"))
+# Redis 홀드가 유실돼도 booked_at 이 TTL + GRACE 초 지난 미결제 티켓은 스위퍼가 취소
+SEAT_HOLD_STALE_GRACE = int(os.environ.get("SEAT_HOLD_STALE_GRACE", "60"))
+
+# 메일 (티켓 공유 알림). 기본은 콘솔 출력, 운영에서는 EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "587"))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "True") == "True"
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "noreply@ticket.local")
+
+# 예매 대기열: 켜면 예매/결제에 입장한 대기열 토큰(X-Queue-Token)이 필요
+WAITING_ROOM_ENABLED = os.environ.get("WAITING_ROOM_ENABLED", "False") == "True"
+WAITING_ROOM_ADMIT_RATE = float(os.environ.get("WAITING_ROOM_ADMIT_RATE", "10"))  # 공연별 초당 입장 인원 기본값
+WAITING_ROOM_ADMIT_BURST = int(os.environ.get("WAITING_ROOM_ADMIT_BURST", "100"))  # 오픈 즉시 입장시키는 인원
+WAITING_ROOM_ADMISSION_TTL = int(os.environ.get("WAITING_ROOM_ADMISSION_TTL", "600"))  # 입장 후 예매/결제 가능 시간(초)
+WAITING_ROOM_TOKEN_TTL = int(os.environ.get("WAITING_ROOM_TOKEN_TTL", "7200"))
+
+# 상세 조회수는 Redis 에 모았다가 VIEW_COUNT_FLUSH_INTERVAL 초마다 DB 에 반영
+VIEW_COUNT_FLUSH_INTERVAL = float(os.environ.get("VIEW_COUNT_FLUSH_INTERVAL", "10"))
+
+CELERY_BEAT_SCHEDULE = {
+    'cancel-expired-tickets': {
+        'task': 'tickets.tasks.cancel_expired_tickets',
+        'schedule': SEAT_HOLD_SWEEP_INTERVAL,
+    },
+    'reconcile-zone-counts': {
+        'task': 'events.tasks.reconcile_zone_counts',
+        'schedule': float(os.environ.get("ZONE_COUNT_RECONCILE_INTERVAL", "300")),
+    },
+    'flush-event-views': {
+        'task': 'events.tasks.flush_event_views',
+        'schedule': VIEW_COUNT_FLUSH_INTERVAL,
+    },
+}
+
 # 앱 등록
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -128,6 +193,24 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # AWS Rekognition용 환경변수 불러오기
 AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
+AWS_REGION = os.environ.get("AWS_REGION", "ap-northeast-2")
+
+# Rekognition 클라이언트 설정 (tickets/rekognition.py)
+REKOGNITION_COLLECTION_ID = os.environ.get("REKOGNITION_COLLECTION_ID", "my-tickets")
+AWS_REKOGNITION_ENDPOINT_URL = os.environ.get("AWS_REKOGNITION_ENDPOINT_URL") or None  # moto/가짜 서버 사용 시 지정
+REKOGNITION_MAX_POOL_CONNECTIONS = int(os.environ.get("REKOGNITION_MAX_POOL_CONNECTIONS", "20"))
+REKOGNITION_CONNECT_TIMEOUT = float(os.environ.get("REKOGNITION_CONNECT_TIMEOUT", "2"))
+REKOGNITION_READ_TIMEOUT = float(os.environ.get("REKOGNITION_READ_TIMEOUT", "10"))
+REKOGNITION_MAX_ATTEMPTS = int(os.environ.get("REKOGNITION_MAX_ATTEMPTS", "3"))
+
+# 안티스푸핑(AI) 서버 클라이언트 설정 (tickets/anti_spoof_client.py)
+AI_SERVER_URL = os.environ.get("AI_SERVER_URL")
+ANTI_SPOOF_TIMEOUT = float(os.environ.get("ANTI_SPOOF_TIMEOUT", "5"))
+ANTI_SPOOF_MAX_RETRIES = int(os.environ.get("ANTI_SPOOF_MAX_RETRIES", "2"))
+ANTI_SPOOF_DEADLINE = float(os.environ.get("ANTI_SPOOF_DEADLINE", "5"))  # 재시도 포함 전체 대기 시간(초)
+ANTI_SPOOF_POOL_SIZE = int(os.environ.get("ANTI_SPOOF_POOL_SIZE", "10"))
+ANTI_SPOOF_BREAKER_THRESHOLD = int(os.environ.get("ANTI_SPOOF_BREAKER_THRESHOLD", "5"))
+ANTI_SPOOF_BREAKER_RESET = float(os.environ.get("ANTI_SPOOF_BREAKER_RESET", "30"))
 
 SPECTACULAR_SETTINGS = {
     'TITLE': 'TeamG Face Ticketing API',
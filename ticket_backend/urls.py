@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include, re_path
-from events.views import EventListAPIView, EventDetailAPIView, EventSeatsAPIView, BuyTicketsView, PayTicketView
-from tickets.views import FaceRegisterAPIView, TicketFaceAuthAPIView, face_register_page, MyTicketListView, AWSFaceRecognitionRegister, AWSFaceRecognitionAuth
+from events.views import EventListAPIView, EventDetailAPIView, EventSeatsAPIView, BuyTicketsView, PayTicketView, zone_seat_stream
+from events.views import WaitingRoomJoinView, WaitingRoomStatusView, EventAutocompleteAPIView
+from tickets.views import FaceRegisterAPIView, TicketFaceAuthAPIView, face_register_page, MyTicketListView, AWSFaceRecognitionRegister, AWSFaceRecognitionAuth, aws_face_register_async
 from tickets.views import FaceListAPIView, FaceDeleteAPIView, ShareTicketsView, TicketQRView, checkin_ticket_view, TicketDetailView, FaceGuideCheckAPIView
 from user.views import UserSignupView, UserLoginView, UserLogoutView
-from tickets.views import TicketCertificationAPIView
+from tickets.views import TicketCertificationAPIView, CheckinSyncAPIView
 
 from django.conf import settings
 from django.conf.urls.static import static
@@ -19,8 +20,12 @@ from .metrics import metrics_view
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/events/view/', EventListAPIView.as_view(), name='event-list'),
+    path('api/v1/events/autocomplete/', EventAutocompleteAPIView.as_view(), name='event-autocomplete'),
     path('api/v1/events/<int:event_id>/', EventDetailAPIView.as_view(), name='event-detail'),
     path('api/v1/events/<int:zone_id>/seats/', EventSeatsAPIView.as_view(), name='event-seats'),
+    path('api/v1/events/<int:zone_id>/seats/stream/', zone_seat_stream, name='event-seats-stream'),
+    path('api/v1/events/<int:event_id>/queue/', WaitingRoomJoinView.as_view(), name='waiting-room-join'),
+    path('api/v1/events/<int:event_id>/queue/<str:token>/', WaitingRoomStatusView.as_view(), name='waiting-room-status'),
     path('api/v1/events/<int:event_id>/tickets/buy', BuyTicketsView.as_view(), name = 'buy-ticket'),
     path('api/v1/events/<int:purchase_id>/tickets/pay/', PayTicketView.as_view(), name='pay-ticket'),
     path('api/v1/tickets/<int:purchase_id>/share/', ShareTicketsView.as_view(), name='share-tickets'),
@@ -34,10 +39,12 @@ urlpatterns = [
     path('api/v1/user/logout/', UserLogoutView.as_view(), name='logout'),
 
     path('api/v1/tickets/<int:ticket_id>/checkin', checkin_ticket_view, name='ticket-checkin'),
+    path('api/v1/tickets/checkins/sync/', CheckinSyncAPIView.as_view(), name='ticket-checkin-sync'),
 
     path('api/v1/tickets/<int:ticket_id>/register/', FaceRegisterAPIView.as_view(), name='ticket-face-register'),
     path('api/v1/tickets/<int:ticket_id>/auth/', TicketFaceAuthAPIView.as_view(), name='ticket-face-auth'),
     path('api/v1/tickets/<int:ticket_id>/aws-register/', AWSFaceRecognitionRegister.as_view(), name='aws-face-register'),
+    path('api/v1/tickets/<int:ticket_id>/aws-register/async/', aws_face_register_async, name='aws-face-register-async'),
     path('api/v1/tickets/<int:ticket_id>/aws-auth/', AWSFaceRecognitionAuth.as_view(), name='aws-face-auth'),
 
     path('api/v1/tickets/face-register/', face_register_page, name='face-register'),
@@ -0,0 +1,236 @@
+"""
+안티스푸핑(AI) 서버 공용 클라이언트
+
+- keep-alive 커넥션 풀을 프로세스 단위로 재사용 (요청마다 TCP 연결을 새로 만들지 않음)
+- 연결 오류/타임아웃/5xx 응답은 지터(jitter)가 들어간 지수 백오프로 재시도
+- 재시도와 백오프를 합친 전체 시간은 ANTI_SPOOF_DEADLINE 초를 넘지 않음 (동기 뷰의 워커를 오래 잡지 않도록)
+- 연속 실패가 임계치를 넘으면 서킷 브레이커가 열려 일정 시간 동안 바로 실패 처리
+- 동기 뷰용 AntiSpoofClient(requests), 비동기 뷰용 AsyncAntiSpoofClient(httpx) 제공
+  (ASGI 서버의 비동기 얼굴 등록은 추론을 기다리는 동안 워커를 점유하지 않음)
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class AntiSpoofError(Exception):
+    def __init__(self, message, status_code=None, detail=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AntiSpoofUnavailable(AntiSpoofError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않은 경우"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            # reset_timeout 이 지나면 half-open: 요청 하나를 흘려보내 상태 확인
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"[AntiSpoof] 서킷 브레이커 open (연속 실패 {self._failures}회)")
+                self._opened_at = time.monotonic()
+
+
+def _backoff(attempt, base, cap):
+    # full jitter: 0 ~ min(cap, base * 2^attempt)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _parse_response(status_code, text, json_loader):
+    if status_code != 200:
+        raise AntiSpoofError("안티스푸핑 서버 오류", status_code=status_code, detail=text)
+    return json_loader()
+
+
+class AntiSpoofClient:
+    def __init__(self, base_url, timeout, max_retries, pool_size, breaker, deadline, backoff_base=0.1, backoff_cap=1.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.breaker = breaker
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def predict(self, image_base64):
+        if not self.breaker.allow():
+            raise AntiSpoofUnavailable("안티스푸핑 서버를 일시적으로 사용할 수 없습니다.")
+
+        deadline = time.monotonic() + self.deadline
+        last_error = AntiSpoofError("안티스푸핑 서버 응답 시간 초과")
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = _backoff(attempt - 1, self.backoff_base, self.backoff_cap)
+                if time.monotonic() + delay >= deadline:
+                    break
+                time.sleep(delay)
+            # 남은 시간만큼만 기다림
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/predict",
+                    json={"image": image_base64},
+                    timeout=min(self.timeout, remaining)
+                )
+            except requests.RequestException as e:
+                last_error = AntiSpoofError("안티스푸핑 서버 연결 실패", detail=str(e))
+                continue
+            if response.status_code in RETRY_STATUS_CODES:
+                last_error = AntiSpoofError("안티스푸핑 서버 오류", status_code=response.status_code, detail=response.text)
+                continue
+            self.breaker.record_success()
+            return _parse_response(response.status_code, response.text, response.json)
+
+        self.breaker.record_failure()
+        raise last_error
+
+
+class AsyncAntiSpoofClient:
+    def __init__(self, base_url, timeout, max_retries, pool_size, breaker, deadline, backoff_base=0.1, backoff_cap=1.0):
+        import httpx
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.breaker = breaker
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._httpx = httpx
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def predict(self, image_base64):
+        if not self.breaker.allow():
+            raise AntiSpoofUnavailable("안티스푸핑 서버를 일시적으로 사용할 수 없습니다.")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        last_error = AntiSpoofError("안티스푸핑 서버 응답 시간 초과")
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = _backoff(attempt - 1, self.backoff_base, self.backoff_cap)
+                if loop.time() + delay >= deadline:
+                    break
+                await asyncio.sleep(delay)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                response = await self.client.post(
+                    f"{self.base_url}/predict",
+                    json={"image": image_base64},
+                    timeout=min(self.timeout, remaining)
+                )
+            except self._httpx.HTTPError as e:
+                last_error = AntiSpoofError("안티스푸핑 서버 연결 실패", detail=str(e))
+                continue
+            if response.status_code in RETRY_STATUS_CODES:
+                last_error = AntiSpoofError("안티스푸핑 서버 오류", status_code=response.status_code, detail=response.text)
+                continue
+            self.breaker.record_success()
+            return _parse_response(response.status_code, response.text, response.json)
+
+        self.breaker.record_failure()
+        raise last_error
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+# 프로세스 단위로 공유하는 인스턴스 (gunicorn fork 이후 pid 가 바뀌면 새로 생성)
+_breaker = None
+_client = None
+_async_clients = {}
+_pid = None
+_lock = threading.Lock()
+
+
+def _client_kwargs():
+    base_url = settings.AI_SERVER_URL
+    if not base_url:
+        raise AntiSpoofError("AI 서버 주소가 설정되어 있지 않습니다.")
+    return {
+        'base_url': base_url,
+        'timeout': settings.ANTI_SPOOF_TIMEOUT,
+        'max_retries': settings.ANTI_SPOOF_MAX_RETRIES,
+        'deadline': settings.ANTI_SPOOF_DEADLINE,
+        'pool_size': settings.ANTI_SPOOF_POOL_SIZE,
+        'breaker': _breaker,
+    }
+
+
+def _reset_if_forked():
+    global _breaker, _client, _async_clients, _pid
+    if _pid != os.getpid():
+        _pid = os.getpid()
+        _client = None
+        _async_clients = {}
+        _breaker = CircuitBreaker(
+            settings.ANTI_SPOOF_BREAKER_THRESHOLD,
+            settings.ANTI_SPOOF_BREAKER_RESET,
+        )
+
+
+def get_anti_spoof_client():
+    global _client
+    with _lock:
+        _reset_if_forked()
+        if _client is None:
+            _client = AntiSpoofClient(**_client_kwargs())
+        return _client
+
+
+def get_async_anti_spoof_client():
+    # httpx.AsyncClient 는 생성된 이벤트 루프에 묶이므로 루프별로 하나씩 유지 (동기/비동기 클라이언트가 서킷 브레이커는 공유)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _reset_if_forked()
+        client = _async_clients.get(id(loop))
+        if client is None:
+            client = AsyncAntiSpoofClient(**_client_kwargs())
+            _async_clients[id(loop)] = client
+        return client
@@ -0,0 +1,18 @@
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+
+
+@checks.register(checks.Tags.security)
+def check_qr_signing_key(app_configs, **kwargs):
+    # QR 체크인 토큰 서명 키가 없거나 형식이 틀리면 runserver/migrate/check 단계에서 알려줌
+    from .qr import signing_key
+
+    try:
+        signing_key()
+    except ImproperlyConfigured as e:
+        return [checks.Error(
+            str(e),
+            hint='README 의 "QR 체크인 토큰 서명 키" 항목을 참고해 .env 에 QR_SIGNING_KEY 를 추가하세요.',
+            id='tickets.E001',
+        )]
+    return []
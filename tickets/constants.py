@@ -0,0 +1,6 @@
+"""
+tickets 앱 공용 상수 (다른 모듈을 import 하지 않음)
+"""
+
+# 만료 티켓 스위퍼 실행 통계를 남기는 Redis 해시 (tickets.tasks 가 기록, ticket_backend.metrics 가 노출)
+SWEEPER_METRICS_KEY = 'metrics:expired_ticket_sweeper'
@@ -0,0 +1,118 @@
+"""
+Rekognition 컬렉션의 로컬 얼굴 인덱스(FaceRegistry) 관리
+
+중복 등록 확인을 컬렉션 전체 list_faces 대신 DB 인덱스 조회 한 번으로 처리하기 위해 사용
+"""
+import re
+
+from django.db import transaction
+
+from user.models import User
+from .models import FaceRegistry, Ticket
+
+EXTERNAL_IMAGE_ID_PATTERN = re.compile(r'^user_(\d+)_ticket_(\d+)$')
+
+
+def parse_external_image_id(external_image_id):
+    # "user_{user_id}_ticket_{ticket_id}" → (user_id, ticket_id), 형식이 다르면 (None, None)
+    match = EXTERNAL_IMAGE_ID_PATTERN.match(external_image_id or '')
+    if not match:
+        return None, None
+    return int(match.group(1)), int(match.group(2))
+
+
+def is_registered(external_image_id, rekognition=None, collection_id=None):
+    # 배포 직후 sync_face_registry 를 아직 돌리지 않아 인덱스가 비어 있으면 컬렉션으로 한 번 채운 뒤 확인
+    # (비어 있는 동안 중복 등록을 놓치지 않도록. 한 번 채워지면 이후로는 DB 조회만 함)
+    if rekognition is not None and not FaceRegistry.objects.exists():
+        sync_face_registry(rekognition, collection_id)
+    return FaceRegistry.objects.filter(external_image_id=external_image_id).exists()
+
+
+def _build_entries(faces):
+    # faces: [(face_id, external_image_id), ...] → 존재하는 user/ticket만 FK로 연결한 FaceRegistry 목록
+    parsed = {face_id: parse_external_image_id(external_id) for face_id, external_id in faces}
+    user_ids = {user_id for user_id, _ in parsed.values() if user_id is not None}
+    ticket_ids = {ticket_id for _, ticket_id in parsed.values() if ticket_id is not None}
+    existing_users = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True)) if user_ids else set()
+    existing_tickets = set(Ticket.objects.filter(id__in=ticket_ids).values_list('id', flat=True)) if ticket_ids else set()
+
+    entries = []
+    for face_id, external_id in faces:
+        user_id, ticket_id = parsed[face_id]
+        entries.append(FaceRegistry(
+            face_id=face_id,
+            external_image_id=external_id,
+            user_id=user_id if user_id in existing_users else None,
+            ticket_id=ticket_id if ticket_id in existing_tickets else None,
+        ))
+    return entries
+
+
+def record_indexed_faces(face_records):
+    # index_faces 응답의 FaceRecords 를 그대로 저장
+    faces = [
+        (record['Face']['FaceId'], record['Face'].get('ExternalImageId', ''))
+        for record in face_records
+    ]
+    FaceRegistry.objects.bulk_create(_build_entries(faces), ignore_conflicts=True)
+
+
+def forget_faces(face_ids):
+    FaceRegistry.objects.filter(face_id__in=face_ids).delete()
+
+
+def iter_collection_faces(rekognition, collection_id):
+    response = rekognition.list_faces(CollectionId=collection_id, MaxResults=4096)
+    yield from response.get('Faces', [])
+    next_token = response.get('NextToken')
+    while next_token:
+        response = rekognition.list_faces(CollectionId=collection_id, NextToken=next_token, MaxResults=4096)
+        yield from response.get('Faces', [])
+        next_token = response.get('NextToken')
+
+
+def sync_face_registry(rekognition, collection_id):
+    # 컬렉션을 기준으로 로컬 인덱스를 맞춤 (누락 추가 / 사라진 얼굴 삭제 / ExternalImageId 변경 반영)
+    remote = {
+        face['FaceId']: face.get('ExternalImageId', '')
+        for face in iter_collection_faces(rekognition, collection_id)
+    }
+    local = dict(FaceRegistry.objects.values_list('face_id', 'external_image_id'))
+
+    missing = [(face_id, external_id) for face_id, external_id in remote.items() if face_id not in local]
+    stale = [face_id for face_id in local if face_id not in remote]
+    changed = [
+        (face_id, external_id) for face_id, external_id in remote.items()
+        if face_id in local and local[face_id] != external_id
+    ]
+
+    with transaction.atomic():
+        if stale:
+            forget_faces(stale)
+        if changed:
+            forget_faces([face_id for face_id, _ in changed])
+        if missing or changed:
+            FaceRegistry.objects.bulk_create(_build_entries(missing + changed), ignore_conflicts=True)
+
+    return {
+        'remote': len(remote),
+        'added': len(missing),
+        'removed': len(stale),
+        'updated': len(changed),
+    }
+
+
+def list_registered_faces(cursor=None, limit=100, user_id=None, ticket_id=None):
+    # id 기준 커서 페이지네이션: cursor 보다 큰 id 부터 limit 개, 다음 커서는 마지막 id
+    queryset = FaceRegistry.objects.order_by('id')
+    if cursor:
+        queryset = queryset.filter(id__gt=cursor)
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+    if ticket_id:
+        queryset = queryset.filter(ticket_id=ticket_id)
+
+    rows = list(queryset.values_list('id', 'face_id', 'external_image_id')[:limit + 1])
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,57 @@
+"""
+Redis 기반 좌석 홀드
+
+티켓마다 auto_cancel_ticket 을 countdown 으로 예약하는 대신
+sorted set 하나(seat_holds)에 ticket_id 를 만료 시각(score)과 함께 넣어두고,
+주기적으로 도는 스위퍼(tickets.tasks.cancel_expired_tickets)가 만료된 홀드를 한꺼번에 정리한다.
+"""
+import logging
+import time
+
+import redis
+from django.conf import settings
+
+from ticket_backend.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+HOLDS_KEY = 'seat_holds'
+
+# 만료된 홀드를 꺼내면서 삭제 (여러 스위퍼가 동시에 돌아도 같은 티켓을 두 번 꺼내지 않도록 원자적으로 처리)
+_POP_EXPIRED_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+
+def create_holds(ticket_ids, ttl=None):
+    # 홀드 생성/연장 (이미 있으면 만료 시각만 갱신). Redis 장애 시 예매 자체는 막지 않고 False 반환
+    if not ticket_ids:
+        return True
+    expires_at = time.time() + (ttl or settings.SEAT_HOLD_TTL)
+    try:
+        get_redis().zadd(HOLDS_KEY, {str(ticket_id): expires_at for ticket_id in ticket_ids})
+    except redis.RedisError as e:
+        logger.error(f"[SeatHold] 홀드 생성 실패 {list(ticket_ids)}: {e}")
+        return False
+    return True
+
+
+def release_holds(ticket_ids):
+    if not ticket_ids:
+        return True
+    try:
+        get_redis().zrem(HOLDS_KEY, *[str(ticket_id) for ticket_id in ticket_ids])
+    except redis.RedisError as e:
+        logger.error(f"[SeatHold] 홀드 해제 실패 {list(ticket_ids)}: {e}")
+        return False
+    return True
+
+
+def pop_expired_holds(limit=500, now=None):
+    now = now or time.time()
+    ids = get_redis().eval(_POP_EXPIRED_SCRIPT, 1, HOLDS_KEY, now, limit)
+    return [int(ticket_id) for ticket_id in ids]
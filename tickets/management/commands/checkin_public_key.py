@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from tickets.qr import public_key_b64
+
+
+class Command(BaseCommand):
+    help = "입장 게이트 스캐너에 배포할 QR 체크인 토큰 검증용 공개키(Ed25519, base64)를 출력합니다."
+
+    def handle(self, *args, **options):
+        self.stdout.write(public_key_b64())
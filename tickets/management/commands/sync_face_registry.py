@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from tickets.face_registry import sync_face_registry
+from tickets.rekognition import get_rekognition_client, COLLECTION_ID
+
+
+class Command(BaseCommand):
+    help = "AWS Rekognition 컬렉션의 얼굴 목록으로 로컬 face_registry 테이블을 재동기화합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collection-id', default=COLLECTION_ID)
+
+    def handle(self, *args, **options):
+        result = sync_face_registry(get_rekognition_client(), options['collection_id'])
+        self.stdout.write(self.style.SUCCESS(
+            f"face_registry 동기화 완료: 컬렉션 {result['remote']}개, "
+            f"추가 {result['added']}, 삭제 {result['removed']}, 변경 {result['updated']}"
+        ))
@@ -0,0 +1,17 @@
+# Generated manually for tickets app
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0002_faceregistry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['ticket_status', 'booked_at'], name='ticket_status_booked_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated manually for tickets app
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_ticket_status_booked_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', 'is_deleted', 'ticket_status'], name='ticket_user_status_idx'),
+        ),
+    ]
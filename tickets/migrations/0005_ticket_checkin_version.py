@@ -0,0 +1,18 @@
+# Generated manually for tickets app
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_ticket_user_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='checkin_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -30,9 +30,32 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_deleted = models.BooleanField(default=False)
+    # QR 체크인 토큰 버전. 공유/취소 시 올려서 이전에 발급한 QR 을 무효화 (tickets/qr.py)
+    checkin_version = models.PositiveIntegerField(default=1)
 
     class Meta:
         db_table = 'ticket'
+        indexes = [
+            # 만료 티켓 스위퍼: ticket_status='booked' AND booked_at < ?
+            models.Index(fields=['ticket_status', 'booked_at'], name='ticket_status_booked_idx'),
+            # 내 티켓 목록: user_id=? [AND ticket_status=?], 삭제 여부 확인
+            models.Index(fields=['user', 'is_deleted', 'ticket_status'], name='ticket_user_status_idx'),
+        ]
     
     def __str__(self):
-        return f"Ticket {self.id}"
\ No newline at end of file
+        return f"Ticket {self.id}"
+
+class FaceRegistry(models.Model):
+    # AWS Rekognition 컬렉션에 등록된 얼굴의 로컬 인덱스 (ExternalImageId → FaceId)
+    # index_faces 성공 시 추가, delete_faces 성공 시 삭제, sync_face_registry 커맨드로 컬렉션과 동기화
+    external_image_id = models.CharField(max_length=255, db_index=True)
+    face_id = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    ticket = models.ForeignKey(Ticket, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'face_registry'
+
+    def __str__(self):
+        return f"{self.external_image_id} ({self.face_id})"
@@ -0,0 +1,184 @@
+"""
+티켓 QR 코드 렌더링
+
+QR 이미지는 같은 내용(payload)이면 항상 같으므로, payload 의 sha256 을 키로 Django 캐시(Redis)에 저장한다.
+  qr:<png|svg>:<sha256(payload)>
+- 티켓 화면을 여러 번 열어도 qrcode 렌더링은 처음 한 번만 실행
+- 결제 완료 시 tasks.pregenerate_ticket_qr 가 미리 만들어 둠
+- 키가 내용 해시라서 ETag 로 그대로 씀 (공유/취소로 토큰이 바뀌면 ETag 도 바뀜)
+
+QR 에는 서명된 체크인 토큰을 넣는다 (Ed25519, QR_SIGNING_KEY).
+  <base64(json 클레임)>.<base64(서명)>
+토큰에 티켓/회차/좌석/소유자/버전/만료 시각이 들어 있어 입장 게이트 스캐너는 공개키만으로 DB 조회 없이 검증하고,
+체크인 결과는 나중에 /api/v1/tickets/checkins/sync/ 로 모아서 올린다.
+- 서버만 개인키를 갖고, 스캐너에는 공개키(manage.py checkin_public_key)만 배포
+- 공유/취소 시 Ticket.checkin_version 이 올라가므로 이전에 출력한 QR 은 동기화 API 의 revoked 목록으로 거절
+"""
+import binascii
+import datetime
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+from io import BytesIO
+
+import qrcode
+import qrcode.image.svg
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+QR_KINDS = ('png', 'svg')
+
+
+class InvalidCheckinToken(Exception):
+    pass
+
+
+@functools.lru_cache(maxsize=4)
+def _load_private_key(encoded):
+    try:
+        return Ed25519PrivateKey.from_private_bytes(signing.b64_decode(encoded.encode('ascii')))
+    except (ValueError, binascii.Error) as e:
+        raise ImproperlyConfigured(f'QR_SIGNING_KEY 는 base64 로 인코딩한 Ed25519 개인키(32바이트)여야 합니다: {e}')
+
+
+def signing_key():
+    # SECRET_KEY(JWT 서명)와 분리된 전용 키만 사용. 설정 누락은 시스템 체크(tickets.E001)로도 확인
+    if not settings.QR_SIGNING_KEY:
+        raise ImproperlyConfigured(
+            'QR_SIGNING_KEY 가 설정되지 않았습니다. '
+            '(python -c "from tickets.qr import generate_signing_key; print(generate_signing_key())")'
+        )
+    return _load_private_key(settings.QR_SIGNING_KEY)
+
+
+def public_key_b64():
+    # 스캐너에 배포할 공개키 (raw 32바이트, base64)
+    raw = signing_key().public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return signing.b64_encode(raw).decode('ascii')
+
+
+def generate_signing_key():
+    # 새 개인키 발급 (settings 없이도 호출 가능)
+    raw = Ed25519PrivateKey.generate().private_bytes(
+        serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption()
+    )
+    return signing.b64_encode(raw).decode('ascii')
+
+
+def checkin_token_expiry(event_time):
+    # 공연 종료 시각 + QR_TOKEN_GRACE 초 (unix timestamp)
+    ends_at = timezone.make_aware(datetime.datetime.combine(event_time.event_date, event_time.end_time))
+    return int(ends_at.timestamp()) + settings.QR_TOKEN_GRACE
+
+
+def make_checkin_token(ticket):
+    # ticket 은 seat__zone__event_time 을 select_related 한 인스턴스
+    event_time = ticket.seat.zone.event_time
+    body = signing.b64_encode(json.dumps(
+        {
+            't': ticket.id,
+            'e': event_time.id,
+            's': ticket.seat.seat_number,
+            'u': ticket.user_id,
+            'v': ticket.checkin_version,
+            'x': checkin_token_expiry(event_time),
+        },
+        separators=(',', ':'), sort_keys=True,
+    ).encode('utf-8'))
+    # Ed25519 서명은 결정적이라 같은 티켓이면 항상 같은 토큰이 나오므로 QR 이미지 캐시(내용 해시 키)를 그대로 재사용할 수 있음
+    signature = signing.b64_encode(signing_key().sign(body))
+    return f"{body.decode('ascii')}.{signature.decode('ascii')}"
+
+
+def read_checkin_token(token, now=None):
+    # 반환: {'ticket_id', 'event_time_id', 'seat_number', 'user_id', 'version', 'expires_at'}  /  위조·만료 시 InvalidCheckinToken
+    # (소유자/버전이 현재 티켓과 같은지는 호출하는 쪽에서 DB 또는 revoked 목록으로 확인)
+    try:
+        body, signature = token.encode('ascii').split(b'.')
+        signing_key().public_key().verify(signing.b64_decode(signature), body)
+        data = json.loads(signing.b64_decode(body))
+        claims = {
+            'ticket_id': data['t'],
+            'event_time_id': data['e'],
+            'seat_number': data['s'],
+            'user_id': data['u'],
+            'version': data['v'],
+            'expires_at': data['x'],
+        }
+    except (ValueError, TypeError, KeyError, InvalidSignature):
+        raise InvalidCheckinToken('위조되었거나 손상된 QR 입니다.')
+    if (now or time.time()) > claims['expires_at']:
+        raise InvalidCheckinToken('유효 기간이 지난 QR 입니다.')
+    return claims
+
+
+def is_current(claims, ticket):
+    # 공유(소유자 변경)/취소 이후에는 이전 QR 을 받지 않음
+    return claims['user_id'] == ticket.user_id and claims['version'] == ticket.checkin_version
+
+
+def ticket_qr_payload(ticket):
+    api_base_url = os.environ.get("API_BASE_URL")
+    return f"{api_base_url}/api/v1/tickets/{ticket.id}/checkin?token={make_checkin_token(ticket)}"
+
+
+def payload_digest(payload):
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _cache_key(kind, digest):
+    return f'qr:{kind}:{digest}'
+
+
+def render(payload, kind='png'):
+    buffer = BytesIO()
+    if kind == 'svg':
+        qrcode.make(payload, image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qrcode.make(payload).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def get_qr(payload, kind='png'):
+    # 반환: (sha256 digest, 이미지 bytes). 캐시 장애 시에도 렌더링해서 돌려줌
+    digest = payload_digest(payload)
+    key = _cache_key(kind, digest)
+    try:
+        image = cache.get(key)
+    except Exception as e:
+        logger.error(f"[QR] 캐시 조회 실패: {e}")
+        return digest, render(payload, kind)
+    if image is None:
+        image = render(payload, kind)
+        try:
+            cache.set(key, image, settings.QR_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"[QR] 캐시 저장 실패: {e}")
+    return digest, image
+
+
+def pregenerate(payloads, kinds=QR_KINDS):
+    # 캐시에 없는 것만 렌더링해서 한 번에 저장. 새로 만든 이미지 수 반환
+    keys = {
+        _cache_key(kind, payload_digest(payload)): (payload, kind)
+        for payload in payloads for kind in kinds
+    }
+    existing = cache.get_many(list(keys))
+    rendered = {
+        key: render(payload, kind)
+        for key, (payload, kind) in keys.items() if key not in existing
+    }
+    if rendered:
+        cache.set_many(rendered, settings.QR_CACHE_TTL)
+    return len(rendered)
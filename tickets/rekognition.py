@@ -0,0 +1,60 @@
+"""
+AWS Rekognition 클라이언트 팩토리
+
+boto3.client() 는 호출할 때마다 자격 증명을 다시 읽고 서비스 모델을 파싱하고
+새 TLS 연결을 만든다. 워커 프로세스마다 클라이언트를 하나만 만들어 재사용한다.
+(boto3 low-level client 는 스레드 간 공유해도 안전함)
+
+테스트/로컬 환경에서는 AWS_REKOGNITION_ENDPOINT_URL 로 moto 서버나 가짜 서버를 가리키면 된다.
+"""
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+
+COLLECTION_ID = settings.REKOGNITION_COLLECTION_ID
+
+_client = None
+_pid = None
+_lock = threading.Lock()
+
+
+def _create_client():
+    config = Config(
+        region_name=settings.AWS_REGION,
+        max_pool_connections=settings.REKOGNITION_MAX_POOL_CONNECTIONS,
+        connect_timeout=settings.REKOGNITION_CONNECT_TIMEOUT,
+        read_timeout=settings.REKOGNITION_READ_TIMEOUT,
+        retries={
+            'mode': 'adaptive',
+            'max_attempts': settings.REKOGNITION_MAX_ATTEMPTS,
+        },
+    )
+    return boto3.session.Session().client(
+        'rekognition',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        endpoint_url=settings.AWS_REKOGNITION_ENDPOINT_URL,
+        config=config,
+    )
+
+
+def get_rekognition_client():
+    global _client, _pid
+    # gunicorn fork 이후에는 부모 프로세스의 커넥션 풀을 공유하지 않도록 새로 생성
+    if _client is None or _pid != os.getpid():
+        with _lock:
+            if _client is None or _pid != os.getpid():
+                _client = _create_client()
+                _pid = os.getpid()
+    return _client
+
+
+def reset_rekognition_client():
+    # 설정 변경(테스트에서 endpoint 교체 등) 후 다시 생성하고 싶을 때 사용
+    global _client, _pid
+    with _lock:
+        _client = None
+        _pid = None
@@ -0,0 +1,51 @@
+"""
+티켓 조회용 쿼리 모음
+
+목록/상세 Serializer 가 seat → zone → event_time → event 를 따라가며 필드를 읽으므로
+한 번의 JOIN 으로 필요한 컬럼만 가져와 N+1 쿼리를 막는다.
+"""
+from .models import Ticket
+
+TICKET_RELATED = 'seat__zone__event_time__event'
+
+# TicketListSerializer 가 사용하는 컬럼
+TICKET_LIST_FIELDS = (
+    'id', 'ticket_status', 'is_deleted',
+    'seat__seat_number',
+    'seat__zone__rank',
+    'seat__zone__event_time__event_date',
+    'seat__zone__event_time__start_time',
+    'seat__zone__event_time__event__name',
+    'seat__zone__event_time__event__location',
+    'seat__zone__event_time__event__image_url',
+)
+
+
+def ticket_detail_queryset():
+    return Ticket.objects.select_related(TICKET_RELATED)
+
+
+def ticket_list_queryset(user_id, ticket_status=None, date_from=None, date_to=None):
+    queryset = (
+        Ticket.objects
+        .filter(user_id=user_id)
+        .select_related(TICKET_RELATED)
+        .only(*TICKET_LIST_FIELDS)
+        .order_by('id')
+    )
+    if ticket_status:
+        queryset = queryset.filter(ticket_status=ticket_status)
+    if date_from:
+        queryset = queryset.filter(seat__zone__event_time__event_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(seat__zone__event_time__event_date__lte=date_to)
+    return queryset
+
+
+def paginate_by_cursor(queryset, cursor=None, limit=20):
+    # id 오름차순 커서 페이지네이션: (현재 페이지 객체 리스트, 다음 커서)
+    if cursor:
+        queryset = queryset.filter(id__gt=cursor)
+    items = list(queryset[:limit + 1])
+    next_cursor = items[limit - 1].id if len(items) > limit else None
+    return items[:limit], next_cursor
@@ -1,23 +1,118 @@
+import time
+from datetime import timedelta
+
+import redis
 from celery import shared_task
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.db.models import F, Q
 from django.utils import timezone
+
+from events.availability import release_seats
+from events.models import Seat
+from ticket_backend.redis_client import get_redis
+from .constants import SWEEPER_METRICS_KEY  # 스위퍼 실행 통계 (ticket_backend/metrics.py 의 수집기가 /metrics 로 노출)
 from .models import Ticket
+from .holds import pop_expired_holds
+from .qr import pregenerate, ticket_qr_payload
+
+
+def cancel_tickets(ticket_ids=(), stale_before=None):
+    """
+    만료된 미결제 티켓을 한 번에 취소한다.
+    - ticket_ids: 홀드가 만료된 티켓 (booked 상태만 취소, 결제 완료된 reserved 티켓은 건드리지 않음)
+    - stale_before: 홀드 유실 대비, 이 시각 이전에 예매되고 아직 booked 인 티켓도 취소
+    조회 1회 + 티켓/좌석 UPDATE 각 1회 + 존별 잔여석 UPDATE 를 하나의 트랜잭션에서 처리
+    """
+    condition = Q(id__in=list(ticket_ids), ticket_status='booked')
+    if stale_before is not None:
+        condition |= Q(ticket_status='booked', booked_at__lt=stale_before)
+
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            Ticket.objects
+            .select_for_update(of=('self',))
+            .filter(condition)
+            .values_list('id', 'seat_id', 'seat__zone_id')
+        )
+        if not rows:
+            return 0
+
+        ids = [ticket_id for ticket_id, _, _ in rows]
+        seat_ids = [seat_id for _, seat_id, _ in rows]
+        Ticket.objects.filter(id__in=ids).update(
+            ticket_status='canceled', is_deleted=True, checkin_version=F('checkin_version') + 1, updated_at=now
+        )
+        Seat.objects.filter(id__in=seat_ids).update(seat_status='available', updated_at=now)
+
+        # 존별 잔여석을 같은 증가량끼리 묶어서 갱신
+        release_seats([(seat_id, zone_id) for _, seat_id, zone_id in rows])
+
+    return len(rows)
+
+
+def _record_sweep(canceled, duration):
+    try:
+        pipe = get_redis().pipeline()
+        pipe.hincrby(SWEEPER_METRICS_KEY, 'runs_total', 1)
+        pipe.hincrby(SWEEPER_METRICS_KEY, 'canceled_total', canceled)
+        pipe.hincrbyfloat(SWEEPER_METRICS_KEY, 'duration_seconds_total', duration)
+        pipe.hset(SWEEPER_METRICS_KEY, mapping={'last_canceled': canceled, 'last_duration_seconds': duration})
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"[Celery] 스위퍼 통계 기록 실패: {e}")
+
 
 @shared_task
 def auto_cancel_ticket(ticket_id):
+    # 좌석 홀드(tickets/holds.py) 도입 전에 예약된 태스크 처리용으로 유지
     print(f"[Celery] 자동취소 태스크 실행: {ticket_id}")
-    try:
-        ticket = Ticket.objects.get(id=ticket_id)
-        print(f"[Celery] 현재 상태: {ticket.ticket_status}")
-        if ticket.ticket_status in ['booked', 'reserved']:
-            ticket.ticket_status = 'canceled'
-            ticket.is_deleted = True
-            ticket.save()
-            # 좌석도 available로 변경
-            seat = ticket.seat
-            seat.seat_status = 'available'
-            seat.save()
-            print(f"[Celery] 티켓 {ticket_id} 취소 및 좌석 available 처리 완료")
-        else:
-            print(f"[Celery] 티켓 {ticket_id}는 이미 상태가 {ticket.ticket_status}라서 취소 안함")
-    except Ticket.DoesNotExist:
-        print(f"[Celery] 티켓 {ticket_id} 없음") 
\ No newline at end of file
+    cancel_tickets([ticket_id])
+
+
+@shared_task
+def cancel_expired_tickets(batch_size=500):
+    # celery beat 로 주기 실행: 홀드가 만료된 티켓(+ 홀드가 유실된 오래된 booked 티켓)을 배치로 취소
+    start = time.monotonic()
+    stale_before = timezone.now() - timedelta(seconds=settings.SEAT_HOLD_TTL + settings.SEAT_HOLD_STALE_GRACE)
+    canceled = 0
+    while True:
+        ticket_ids = pop_expired_holds(limit=batch_size)
+        canceled += cancel_tickets(ticket_ids, stale_before=stale_before)
+        stale_before = None  # 오래된 booked 티켓 확인은 첫 배치에서 한 번만
+        if len(ticket_ids) < batch_size:
+            break
+    duration = time.monotonic() - start
+    _record_sweep(canceled, duration)
+    if canceled:
+        print(f"[Celery] 만료 티켓 {canceled}건 취소 ({duration:.3f}s)")
+    return canceled
+
+
+@shared_task
+def notify_shared_tickets(sharer_name, notifications):
+    # 티켓 공유 알림: 받은 사람별 메일을 한 번의 SMTP 연결로 발송
+    messages = [
+        (
+            f"[Ticket] {sharer_name}님이 티켓을 공유했습니다",
+            f"{sharer_name}님이 '{item['event_name']}' ({item['event_date']}) "
+            f"좌석 {item['seat_number']} 티켓을 공유했습니다.\n티켓 번호: {item['ticket_id']}",
+            settings.DEFAULT_FROM_EMAIL,
+            [item['email']],
+        )
+        for item in notifications
+    ]
+    sent = send_mass_mail(messages, fail_silently=False)
+    print(f"[Celery] 티켓 공유 알림 {sent}건 발송")
+    return sent
+
+
+@shared_task
+def pregenerate_ticket_qr(ticket_ids):
+    # 결제 완료 직후 티켓 QR 이미지(png/svg)를 미리 만들어 캐시에 넣어둠
+    tickets = Ticket.objects.select_related('seat__zone__event_time').filter(id__in=ticket_ids)
+    rendered = pregenerate([ticket_qr_payload(ticket) for ticket in tickets])
+    print(f"[Celery] 티켓 QR {rendered}개 생성")
+    return rendered
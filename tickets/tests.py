@@ -1 +1,228 @@
-from django.test import TestCase
\ No newline at end of file
+from datetime import time, timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from events.models import Event, EventTime, Seat, Zone
+from ticket_backend.query_plan import QueryPlanTestMixin
+from user.models import User
+from .checks import check_qr_signing_key
+from .models import Purchase, Ticket
+from .qr import InvalidCheckinToken, generate_signing_key, is_current, make_checkin_token, read_checkin_token
+from .selectors import ticket_list_queryset
+
+TEST_QR_SIGNING_KEY = generate_signing_key()
+
+
+class TicketQueryPlanTests(QueryPlanTestMixin, TransactionTestCase):
+    # 내 티켓 목록/결제/만료 스위퍼 쿼리가 ticket 테이블 전체를 읽지 않는지 EXPLAIN 으로 확인
+
+    def setUp(self):
+        event = Event.objects.create(
+            name="plan", artist="artist", location="hall", description="",
+            genre="concert", age_rating="all", image_url=""
+        )
+        event_time = EventTime.objects.create(
+            event=event, start_time="19:00", end_time="21:00", event_date="2099-01-01"
+        )
+        zone = Zone.objects.create(event_time=event_time, price=1000, rank="A", total_count=400, available_count=0)
+        Seat.objects.bulk_create([
+            Seat(zone=zone, seat_number=str(number), seat_status='booked') for number in range(400)
+        ])
+        User.objects.bulk_create([
+            User(email=f"plan{number}@example.com", name="plan", phone="000", password="!")
+            for number in range(40)
+        ])
+        users = list(User.objects.order_by('id'))
+        Purchase.objects.bulk_create([Purchase(user=user, purchase_status="완료") for user in users])
+        purchases = {purchase.user_id: purchase for purchase in Purchase.objects.all()}
+
+        now = timezone.now()
+        tickets = []
+        for index, seat in enumerate(Seat.objects.order_by('id')):
+            user = users[index % len(users)]
+            tickets.append(Ticket(
+                user=user, seat=seat, purchase=purchases[user.id],
+                ticket_status='booked' if index % 20 == 0 else 'reserved',
+                booked_at=now - timedelta(minutes=index), face_verified=False, is_deleted=False
+            ))
+        Ticket.objects.bulk_create(tickets)
+        self.analyze_tables('ticket', 'purchase', 'seat')
+        self.user = users[0]
+        self.purchase = purchases[self.user.id]
+
+    def test_my_ticket_list_uses_index(self):
+        self.assertNoFullScan(ticket_list_queryset(self.user.id)[:20], 'ticket')
+        self.assertNoFullScan(ticket_list_queryset(self.user.id, ticket_status='reserved')[:20], 'ticket')
+
+    def test_pay_uses_index(self):
+        self.assertNoFullScan(Ticket.objects.filter(purchase_id=self.purchase.id), 'ticket')
+
+    def test_expired_ticket_sweeper_uses_index(self):
+        stale_before = timezone.now() - timedelta(minutes=30)
+        self.assertNoFullScan(
+            Ticket.objects.filter(ticket_status='booked', booked_at__lt=stale_before), 'ticket'
+        )
+
+
+class MyTicketListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="list@example.com", password="pw", name="list", phone="000")
+        purchase = Purchase.objects.create(user=cls.user, purchase_status="완료")
+        event = Event.objects.create(
+            name="list", artist="artist", location="hall", description="",
+            genre="concert", age_rating="all", image_url=""
+        )
+        for day in range(1, 6):
+            event_time = EventTime.objects.create(
+                event=event, start_time="19:00", end_time="21:00", event_date=f"2099-01-{day:02d}"
+            )
+            zone = Zone.objects.create(event_time=event_time, price=1000, rank="A", total_count=2, available_count=0)
+            for number in range(2):
+                seat = Seat.objects.create(zone=zone, seat_number=str(number), seat_status='booked')
+                Ticket.objects.create(user=cls.user, seat=seat, purchase=purchase, ticket_status='reserved')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_uses_one_query(self):
+        # 티켓 수와 무관하게 JOIN 한 번
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('myticket-list'))
+        self.assertEqual(len(response.data), 10)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('myticket-list'), {'limit': 4, 'date_from': '2099-01-02'})
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertIsNotNone(response.data['next_cursor'])
+
+    def test_non_positive_limit_uses_default(self):
+        response = self.client.get(reverse('myticket-list'), {'limit': -5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_rejects_malformed_dates(self):
+        for params in ({'date_from': 'garbage'}, {'date_to': '2099-13-01'}):
+            response = self.client.get(reverse('myticket-list'), params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class ShareTicketsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(email="owner@example.com", password="pw", name="owner", phone="000")
+        cls.friends = [
+            User.objects.create_user(email=f"friend{number}@example.com", password="pw", name="friend", phone="000")
+            for number in range(2)
+        ]
+        cls.purchase = Purchase.objects.create(user=cls.owner, purchase_status="완료")
+        event = Event.objects.create(
+            name="share", artist="artist", location="hall", description="",
+            genre="concert", age_rating="all", image_url=""
+        )
+        event_time = EventTime.objects.create(
+            event=event, start_time="19:00", end_time="21:00", event_date="2099-01-01"
+        )
+        zone = Zone.objects.create(event_time=event_time, price=1000, rank="A", total_count=3, available_count=0)
+        for number in range(3):
+            seat = Seat.objects.create(zone=zone, seat_number=str(number), seat_status='booked')
+            Ticket.objects.create(user=cls.owner, seat=seat, purchase=cls.purchase, ticket_status='reserved')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_share_uses_fixed_number_of_queries(self):
+        # 공유 인원과 무관하게 SAVEPOINT / 유저 IN 조회 / 티켓 잠금 조회 / UPDATE 한 번 / RELEASE
+        emails = [friend.email for friend in self.friends]
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(5):
+            response = self.client.post(
+                reverse('share-tickets', args=[self.purchase.id]), {'ticket_user_emails': emails}, format='json'
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(len(callbacks), 1)
+
+        tickets = list(Ticket.objects.filter(purchase=self.purchase).order_by('id'))
+        self.assertEqual([ticket.user_id for ticket in tickets], [self.owner.id] + [friend.id for friend in self.friends])
+        self.assertEqual([ticket.checkin_version for ticket in tickets], [1, 2, 2])
+
+    def test_unknown_email_is_rejected(self):
+        response = self.client.post(
+            reverse('share-tickets', args=[self.purchase.id]),
+            {'ticket_user_emails': [self.friends[0].email, 'nobody@example.com']}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['details']['missing_emails'], ['nobody@example.com'])
+        self.assertFalse(Ticket.objects.exclude(user=self.owner).exists())
+
+
+class AsyncFaceRegisterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="face@example.com", password="pw", name="face", phone="000")
+
+    async def test_requires_jwt(self):
+        response = await self.async_client.post(
+            reverse('aws-face-register-async', args=[1]), {'image': 'x'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_requires_image(self):
+        token = str(AccessToken.for_user(self.user))
+        response = await self.async_client.post(
+            reverse('aws-face-register-async', args=[1]), {}, content_type='application/json',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(QR_SIGNING_KEY=TEST_QR_SIGNING_KEY, QR_TOKEN_GRACE=3600)
+class CheckinTokenTests(SimpleTestCase):
+    def setUp(self):
+        event_time = EventTime(id=3, start_time=time(19, 0), end_time=time(21, 0), event_date=timezone.localdate())
+        zone = Zone(id=5, event_time=event_time, price=1000, rank="A", total_count=1, available_count=0)
+        seat = Seat(id=7, zone=zone, seat_number="A-12", seat_status='booked')
+        self.ticket = Ticket(id=11, user_id=13, seat=seat, ticket_status='reserved')
+
+    def test_round_trip(self):
+        claims = read_checkin_token(make_checkin_token(self.ticket))
+        self.assertEqual(claims['ticket_id'], 11)
+        self.assertEqual(claims['event_time_id'], 3)
+        self.assertEqual(claims['seat_number'], "A-12")
+        self.assertEqual(claims['user_id'], 13)
+        self.assertEqual(claims['version'], 1)
+
+    def test_same_ticket_gives_same_token(self):
+        # QR 이미지 캐시가 내용 해시 키라서 토큰이 매번 같아야 함
+        self.assertEqual(make_checkin_token(self.ticket), make_checkin_token(self.ticket))
+
+    def test_rejects_tampered_and_expired_tokens(self):
+        token = make_checkin_token(self.ticket)
+        with self.assertRaises(InvalidCheckinToken):
+            read_checkin_token(token[:-2] + ('AA' if not token.endswith('AA') else 'BB'))
+        with override_settings(QR_SIGNING_KEY=generate_signing_key()):
+            with self.assertRaises(InvalidCheckinToken):
+                read_checkin_token(token)
+        expires_at = read_checkin_token(token)['expires_at']
+        with self.assertRaises(InvalidCheckinToken):
+            read_checkin_token(token, now=expires_at + 1)
+
+    def test_share_or_cancel_supersedes_token(self):
+        claims = read_checkin_token(make_checkin_token(self.ticket))
+        self.assertTrue(is_current(claims, self.ticket))
+        self.ticket.user_id = 14
+        self.assertFalse(is_current(claims, self.ticket))
+        self.ticket.user_id = 13
+        self.ticket.checkin_version = 2
+        self.assertFalse(is_current(claims, self.ticket))
+
+    @override_settings(QR_SIGNING_KEY=None)
+    def test_requires_dedicated_signing_key(self):
+        with self.assertRaises(ImproperlyConfigured):
+            make_checkin_token(self.ticket)
+        self.assertEqual([error.id for error in check_qr_signing_key(None)], ['tickets.E001'])
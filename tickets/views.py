@@ -3,19 +3,20 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.db import connection, transaction
-from rest_framework.permissions import IsAuthenticated
+from django.db.models import F, Q
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from asgiref.sync import sync_to_async
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiTypes, OpenApiExample
-from django.http import JsonResponse
-import boto3
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.conf import settings
 import base64
-import os
-import requests
-import qrcode
 import logging
 import io
-from io import BytesIO
+import json
 from PIL import Image
 
 from .models import Ticket
@@ -24,8 +25,14 @@ from .serializers import (
     TicketListSerializer,
     TicketCertificationSerializer,
 )
-from tickets.tasks import auto_cancel_ticket
+from tickets.tasks import auto_cancel_ticket, notify_shared_tickets
+from tickets.selectors import ticket_list_queryset, ticket_detail_queryset, paginate_by_cursor, TICKET_RELATED
+from tickets.rekognition import get_rekognition_client, COLLECTION_ID
+from tickets.qr import get_qr, ticket_qr_payload, read_checkin_token, is_current, InvalidCheckinToken
+from tickets.face_registry import is_registered, record_indexed_faces, forget_faces, list_registered_faces
+from tickets.anti_spoof_client import get_anti_spoof_client, get_async_anti_spoof_client, AntiSpoofError, AntiSpoofUnavailable
 from user.models import User
+from events.availability import release_seats
 
 # 로깅 설정 (한 번만 설정해두면 됨)
 logger = logging.getLogger(__name__)
@@ -134,112 +141,148 @@ class AWSFaceRecognitionRegister(APIView):
             face_register_failures_total.labels(reason='no_image').inc()
             return Response({"message": "image가 필요합니다."}, status=400)
 
+        user_id = request.user.id
         try:
-            # 1. 원본 base64 디코딩
             image_bytes = base64.b64decode(image_base64)
+            resized_base64 = _anti_spoof_input(image_bytes)
 
-            # 2. 원본을 PIL 이미지로 로드
-            image = Image.open(io.BytesIO(image_bytes))
+            if not settings.AI_SERVER_URL:
+                return Response({"message": "AI 서버 주소가 설정되어 있지 않습니다."}, status=500)
 
-            # 3. 정확한 4:3 비율로 리사이즈
-            target_width = 800
-            target_height = 600  # 정확한 4:3 비율 (800/600 = 4/3)
-            resized_image = image.resize((target_width, target_height))
+            logger.debug(f"[AI 요청 base64 전체] user_id={user_id}, ticket_id={ticket_id}\n{resized_base64}")
 
-            # 4. 리사이즈된 이미지 → 바이트 → base64
-            resized_io = io.BytesIO()
-            resized_image.save(resized_io, format='JPEG')
-            resized_bytes = resized_io.getvalue()
-            resized_base64 = base64.b64encode(resized_bytes).decode('utf-8')
+            try:
+                spoof_result = get_anti_spoof_client().predict(resized_base64)
+            except AntiSpoofError as e:
+                body, status_code = _anti_spoof_error_response(e)
+                return Response(body, status=status_code)
 
+            body, status_code = _register_face(user_id, ticket_id, image_bytes, spoof_result)
+            return Response(body, status=status_code)
 
-            user_id = request.user.id
-            external_image_id = f"user_{user_id}_ticket_{ticket_id}"
-
-            ai_url = os.environ.get("AI_SERVER_URL")
-            if not ai_url:
-                return Response({"message": "AI 서버 주소가 설정되어 있지 않습니다."}, status=500)
-            
-            logger.debug(f"[AI 요청 base64 전체] user_id={user_id}, ticket_id={ticket_id}\n{resized_base64}")
+        except Exception as e:
+            body, status_code = _register_error_response(e, user_id, ticket_id)
+            return Response(body, status=status_code)
+
+
+def _anti_spoof_input(image_bytes):
+    # 안티스푸핑 서버에는 정확한 4:3 비율(800x600)로 리사이즈한 JPEG 를 base64 로 보냄 (Rekognition 에는 원본)
+    image = Image.open(io.BytesIO(image_bytes))
+    resized_io = io.BytesIO()
+    image.resize((800, 600)).save(resized_io, format='JPEG')
+    return base64.b64encode(resized_io.getvalue()).decode('utf-8')
+
+
+def _anti_spoof_error_response(e):
+    # 반환: (응답 body, status)
+    if isinstance(e, AntiSpoofUnavailable):
+        face_register_failures_total.labels(reason='anti_spoof_unavailable').inc()
+        return {"message": str(e)}, 503
+    logger.debug(f"[AI 응답 오류] status={e.status_code}, detail={e.detail}")
+    face_register_failures_total.labels(reason='anti_spoof_error').inc()
+    return {"message": "안티스푸핑 서버 오류", "detail": e.detail}, 500
+
+
+def _register_face(user_id, ticket_id, image_bytes, spoof_result):
+    # 안티스푸핑 결과 확인 → 중복 확인 → Rekognition 등록. 반환: (응답 body, status)
+    external_image_id = f"user_{user_id}_ticket_{ticket_id}"
+    logger.debug(f"[AI 응답 전체] response={spoof_result}")
+    if spoof_result.get("label") != "real":
+        face_register_failures_total.labels(reason='spoofing_detected').inc()
+        return {
+            "message": "스푸핑된 얼굴로 확인되었습니다. 등록이 거부됩니다.",
+            "score": spoof_result.get("score")
+        }, 403
+
+    # AWS 자격 증명 확인
+    if not settings.AWS_ACCESS_KEY_ID or not settings.AWS_SECRET_ACCESS_KEY:
+        logger.error("AWS 자격 증명이 설정되지 않았습니다.")
+        return {"message": "AWS 자격 증명이 설정되지 않았습니다."}, 500
+
+    rekognition = get_rekognition_client()
+    collection_id = COLLECTION_ID
+
+    # 로컬 얼굴 인덱스에서 중복 확인 (컬렉션 전체를 list_faces 로 훑지 않음, 인덱스가 비어 있을 때만 컬렉션으로 채움)
+    if is_registered(external_image_id, rekognition, collection_id):
+        face_register_failures_total.labels(reason='duplicate_face').inc()
+        return {
+            "message": "이미 등록된 얼굴이 있습니다. 중복 등록이 불가합니다.",
+            "ExternalImageId": external_image_id
+        }, 400
+
+    response = rekognition.index_faces(
+        CollectionId=collection_id,
+        Image={'Bytes': image_bytes},
+        ExternalImageId=external_image_id,
+        DetectionAttributes=['DEFAULT']
+    )
 
-            spoof_response = requests.post(
-                f"{ai_url}/predict",
-                json={"image": resized_base64},
-                timeout=5
-            )
-            logger.debug(f"[AI 응답 전체] status={spoof_response.status_code}, response={spoof_response.text}")
-            if spoof_response.status_code != 200:
-                return Response({"message": "안티스푸핑 서버 오류", "detail": spoof_response.text}, status=500)
+    faces = response.get('FaceRecords', [])
+    if not faces:
+        face_register_failures_total.labels(reason='rekognition_no_face_records').inc()
+        return {"message": "얼굴 등록 실패", "response": response}, 400
+
+    record_indexed_faces(faces)
+    return {
+        "message": "얼굴 등록 성공",
+        "FaceId": faces[0]['Face']['FaceId'],
+        "ExternalImageId": faces[0]['Face']['ExternalImageId']
+    }, 200
+
+
+def _register_error_response(e, user_id, ticket_id):
+    logger.error(f"AWS Rekognition 오류 발생: {str(e)}")
+    logger.error(f"오류 타입: {type(e).__name__}")
+    logger.error(f"사용자 ID: {user_id}, 티켓 ID: {ticket_id}")
+    face_register_failures_total.labels(reason='exception').inc()
+    return {"message": "AWS Rekognition 처리 중 오류", "error": str(e)}, 500
+
+
+async def aws_face_register_async(request, ticket_id):
+    # AWSFaceRecognitionRegister 의 비동기 버전 (ASGI stream 서비스에서 제공, nginx 가 라우팅)
+    # 안티스푸핑 추론은 AsyncAntiSpoofClient 로 기다리므로 느린 추론이 워커를 점유하지 않고,
+    # 이미지 처리/Rekognition/DB 처럼 블로킹되는 부분만 스레드에서 실행
+    if request.method != 'POST':
+        return JsonResponse({"message": "POST 요청만 지원합니다."}, status=405)
+    try:
+        auth = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        auth = None
+    if auth is None:
+        return JsonResponse({"detail": "유효한 토큰이 필요합니다."}, status=401)
+    user_id = auth[0].id
 
-            spoof_result = spoof_response.json()
-            if spoof_result.get("label") != "real":
-                
-                face_register_failures_total.labels(reason='spoofing_detected').inc()
-                return Response({
-                   "message": "스푸핑된 얼굴로 확인되었습니다. 등록이 거부됩니다.",
-                   "score": spoof_result.get("score")
-                }, status=403)
+    try:
+        image_base64 = json.loads(request.body or b'{}').get('image')
+    except (ValueError, AttributeError):
+        image_base64 = None
+    if not image_base64:
+        face_register_failures_total.labels(reason='no_image').inc()
+        return JsonResponse({"message": "image가 필요합니다."}, status=400)
 
-            # AWS 자격 증명 확인
-            aws_access_key = os.environ.get('AWS_ACCESS_KEY_ID')
-            aws_secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-            
-            if not aws_access_key or not aws_secret_key:
-                logger.error("AWS 자격 증명이 설정되지 않았습니다.")
-                return Response({"message": "AWS 자격 증명이 설정되지 않았습니다."}, status=500)
-            
-            rekognition = boto3.client(
-                'rekognition',
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key,
-                region_name='ap-northeast-2'
-            )
+    try:
+        image_bytes = base64.b64decode(image_base64)
+        resized_base64 = await sync_to_async(_anti_spoof_input, thread_sensitive=False)(image_bytes)
 
-            collection_id = 'my-tickets'
+        if not settings.AI_SERVER_URL:
+            return JsonResponse({"message": "AI 서버 주소가 설정되어 있지 않습니다."}, status=500)
 
-            faces = []
-            response = rekognition.list_faces(CollectionId=collection_id, MaxResults=60)
-            faces.extend(response.get('Faces', []))
-            next_token = response.get('NextToken')
-            while next_token:
-                response = rekognition.list_faces(CollectionId=collection_id, NextToken=next_token, MaxResults=60)
-                faces.extend(response.get('Faces', []))
-                next_token = response.get('NextToken')
+        try:
+            spoof_result = await get_async_anti_spoof_client().predict(resized_base64)
+        except AntiSpoofError as e:
+            body, status_code = _anti_spoof_error_response(e)
+            return JsonResponse(body, status=status_code)
 
-            if any(face.get('ExternalImageId') == external_image_id for face in faces):
-                
-                face_register_failures_total.labels(reason='duplicate_face').inc()
-                return Response({
-                    "message": "이미 등록된 얼굴이 있습니다. 중복 등록이 불가합니다.",
-                    "ExternalImageId": external_image_id
-                }, status=400)
+        body, status_code = await sync_to_async(_register_face)(user_id, ticket_id, image_bytes, spoof_result)
+        return JsonResponse(body, status=status_code)
 
-            response = rekognition.index_faces(
-                CollectionId=collection_id,
-                Image={'Bytes': image_bytes},
-                ExternalImageId=external_image_id,
-                DetectionAttributes=['DEFAULT']
-            )
+    except Exception as e:
+        body, status_code = _register_error_response(e, user_id, ticket_id)
+        return JsonResponse(body, status=status_code)
 
-            faces = response.get('FaceRecords', [])
-            if faces:
-                return Response({
-                    "message": "얼굴 등록 성공",
-                    "FaceId": faces[0]['Face']['FaceId'],
-                    "ExternalImageId": faces[0]['Face']['ExternalImageId']
-                }, status=200)
-            else:
-                
-                face_register_failures_total.labels(reason='rekognition_no_face_records').inc()
-                return Response({"message": "얼굴 등록 실패", "response": response}, status=400)
 
-        except Exception as e:
-            logger.error(f"AWS Rekognition 오류 발생: {str(e)}")
-            logger.error(f"오류 타입: {type(e).__name__}")
-            logger.error(f"사용자 ID: {user_id}, 티켓 ID: {ticket_id}")
-            
-            face_register_failures_total.labels(reason='exception').inc()
-            return Response({"message": "AWS Rekognition 처리 중 오류", "error": str(e)}, status=500)
+# JWT 인증 API 이므로 CSRF 검사 제외 (Django 4.2 의 csrf_exempt 데코레이터는 비동기 뷰를 감싸지 못해 속성으로 지정)
+aws_face_register_async.csrf_exempt = True
 
 
 @extend_schema(tags=["tickets"])
@@ -299,17 +342,11 @@ class AWSFaceRecognitionAuth(APIView):
             face_auth_failures_total.labels(reason='no_image').inc()
             return Response({"message": "image가 필요합니다."}, status=400)
         try:
-            import base64, os, boto3
             image_bytes = base64.b64decode(image_base64)
             user_id = request.user.id
             external_image_id = f"user_{user_id}_ticket_{ticket_id}"
-            rekognition = boto3.client(
-                'rekognition',
-                aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-                region_name='ap-northeast-2'
-            )
-            collection_id = 'my-tickets'
+            rekognition = get_rekognition_client()
+            collection_id = COLLECTION_ID
             response = rekognition.search_faces_by_image(
                 CollectionId=collection_id,
                 Image={'Bytes': image_bytes},
@@ -596,6 +633,10 @@ class TicketFaceAuthAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+TICKET_LIST_DEFAULT_LIMIT = 20
+TICKET_LIST_MAX_LIMIT = 100
+
+
 @extend_schema(tags=["tickets"])
 class MyTicketListView(APIView):
     authentication_classes = [JWTAuthentication]
@@ -603,13 +644,49 @@ class MyTicketListView(APIView):
 
     @extend_schema(
         summary="나의 티켓 목록 조회",
-        description="JWT 인증된 유저의 모든 티켓 목록을 반환합니다.",
+        description="JWT 인증된 유저의 티켓 목록을 반환합니다. "
+                    "cursor 또는 limit 을 주면 {results, next_cursor} 형태로 커서 페이지네이션됩니다.",
+        parameters=[
+            OpenApiParameter(name='status', description='티켓 상태로 필터 (booked/reserved/canceled 등)', required=False, type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='date_from', description='공연 날짜 시작 (YYYY-MM-DD)', required=False, type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='date_to', description='공연 날짜 끝 (YYYY-MM-DD)', required=False, type=OpenApiTypes.DATE, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='cursor', description='이전 응답의 next_cursor', required=False, type=int, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='limit', description=f'페이지당 개수 (최대 {TICKET_LIST_MAX_LIMIT})', required=False, type=int, location=OpenApiParameter.QUERY),
+        ],
         responses=TicketListSerializer(many=True)  # 응답 스키마 명시
     )
     def get(self, request):
-        tickets = Ticket.objects.filter(user_id=request.user.id)
-        serializer = TicketListSerializer(tickets, many=True)
-        return Response(serializer.data)
+        date_from = request.GET.get('date_from')
+        date_to = request.GET.get('date_to')
+        try:
+            parsed_from = parse_date(date_from) if date_from else None
+            parsed_to = parse_date(date_to) if date_to else None
+            cursor = int(request.GET.get('cursor', 0))
+            limit = int(request.GET.get('limit', 0))
+        except ValueError:
+            return Response({'error': '잘못된 조회 조건입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        # parse_date 는 형식이 틀리면 None 을 돌려주므로 필터가 조용히 빠지지 않도록 직접 확인
+        if (date_from and parsed_from is None) or (date_to and parsed_to is None):
+            return Response({'error': '날짜는 YYYY-MM-DD 형식이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        tickets = ticket_list_queryset(
+            request.user.id,
+            ticket_status=request.GET.get('status'),
+            date_from=parsed_from,
+            date_to=parsed_to,
+        )
+
+        # cursor/limit 이 없으면 기존처럼 전체 목록을 배열로 반환
+        if not cursor and not limit:
+            serializer = TicketListSerializer(tickets, many=True)
+            return Response(serializer.data)
+
+        limit = min(limit, TICKET_LIST_MAX_LIMIT)
+        if limit < 1:
+            limit = TICKET_LIST_DEFAULT_LIMIT
+        page, next_cursor = paginate_by_cursor(tickets, cursor=cursor, limit=limit)
+        serializer = TicketListSerializer(page, many=True)
+        return Response({'results': serializer.data, 'next_cursor': next_cursor})
 
 @extend_schema(tags=["tickets"])
 class TicketDetailView(APIView):
@@ -625,7 +702,7 @@ class TicketDetailView(APIView):
         responses=TicketDetailSerializer  # 응답 스키마 명시
     )
     def get(self, request, ticket_id):
-        ticket = get_object_or_404(Ticket, id=ticket_id, user_id=request.user.id)
+        ticket = get_object_or_404(ticket_detail_queryset(), id=ticket_id, user_id=request.user.id)
         serializer = TicketDetailSerializer(ticket)
         return Response(serializer.data)
 
@@ -668,21 +745,29 @@ class TicketDetailView(APIView):
         }
     )
     def delete(self, request, ticket_id):
-        ticket = get_object_or_404(Ticket, id=ticket_id, user_id=request.user.id)
-        ticket.ticket_status = 'canceled'
-        ticket.is_deleted = True  # 취소 시 soft delete 처리
-        ticket.save()
-
-        # 좌석 상태를 'available'로 변경
-        seat = ticket.seat
-        seat.seat_status = 'available'
-        seat.save()
-
-        # purchase_id가 있으면 purchase_status도 '취소'로 변경
-        purchase_id = getattr(ticket, 'purchase_id', None)
-        if purchase_id:
-            with connection.cursor() as cursor:
-                cursor.execute("UPDATE purchase SET purchase_status=%s WHERE id=%s", ['취소', purchase_id])
+        with transaction.atomic():
+            ticket = get_object_or_404(
+                Ticket.objects.select_for_update().select_related('seat'),
+                id=ticket_id, user_id=request.user.id
+            )
+            already_canceled = ticket.ticket_status == 'canceled'
+            ticket.ticket_status = 'canceled'
+            ticket.is_deleted = True  # 취소 시 soft delete 처리
+            ticket.checkin_version = F('checkin_version') + 1  # 이미 출력한 QR 무효화
+            ticket.save()
+
+            # 좌석 상태를 'available'로 변경 (이미 취소된 티켓이면 좌석이 다른 예매에 잡혀 있을 수 있으므로 건드리지 않음)
+            seat = ticket.seat
+            if not already_canceled:
+                seat.seat_status = 'available'
+                seat.save()
+                release_seats([(seat.id, seat.zone_id)])
+
+            # purchase_id가 있으면 purchase_status도 '취소'로 변경
+            purchase_id = getattr(ticket, 'purchase_id', None)
+            if purchase_id:
+                with connection.cursor() as cursor:
+                    cursor.execute("UPDATE purchase SET purchase_status=%s WHERE id=%s", ['취소', purchase_id])
 
         return Response({
             "message": "티켓이 성공적으로 취소되었습니다.",
@@ -762,16 +847,20 @@ class ShareTicketsView(APIView):
 
         try:
             with transaction.atomic():
-                # 이메일로 유저 조회
-                users = User.objects.filter(email__in=ticket_user_emails)
-                if users.count() != len(ticket_user_emails):
-                    return Response({"error": "일부 이메일이 존재하지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
-
-                email_to_user_id = {user.email: user.id for user in users}
-                shared_user_ids = [email_to_user_id[email] for email in ticket_user_emails]
-
-                # 본인 소유의 해당 구매 티켓들 조회
-                tickets = list(Ticket.objects.select_for_update().filter(
+                # 이메일 → 유저 id 를 IN 한 번으로 조회 (email 유니크 인덱스 사용)
+                # 대소문자 구분은 컬럼 collation 을 따름 (MySQL *_ci 면 구분 안 함), 매칭은 소문자 기준
+                requested_emails = [str(email).strip() for email in ticket_user_emails]
+                email_to_user_id = {
+                    email.lower(): user_id
+                    for user_id, email in User.objects.filter(email__in=set(requested_emails)).values_list('id', 'email')
+                } if requested_emails else {}
+                missing = [email for email in requested_emails if email.lower() not in email_to_user_id]
+                if missing:
+                    return Response({"error": "일부 이메일이 존재하지 않습니다.", "details": {"missing_emails": missing}}, status=status.HTTP_400_BAD_REQUEST)
+                shared_user_ids = [email_to_user_id[email.lower()] for email in requested_emails]
+
+                # 본인 소유의 해당 구매 티켓들 조회 (알림에 쓸 공연 정보까지 함께, 잠금은 티켓 행만)
+                tickets = list(Ticket.objects.select_for_update(of=('self',)).select_related(TICKET_RELATED).filter(
                     purchase__id=purchase_id,
                     user=user  # ✅ 변경된 부분
                 ).order_by('id'))
@@ -796,15 +885,49 @@ class ShareTicketsView(APIView):
                 now = timezone.now()
                 for ticket, new_user_id in zip(tickets_to_share, shared_user_ids):
                     ticket.user_id = new_user_id
+                    ticket.checkin_version = F('checkin_version') + 1  # 이전 소유자의 QR 무효화
                     ticket.updated_at = now
-                    ticket.save()
+                # 바뀐 컬럼만 UPDATE ... SET user_id = CASE id WHEN ... END 한 번으로 반영
+                Ticket.objects.bulk_update(tickets_to_share, ['user', 'checkin_version', 'updated_at'])
+
+                # 받은 사람들에게 알림 메일 (커밋 후 태스크 하나로 일괄 발송)
+                notifications = [
+                    {
+                        "email": email,
+                        "ticket_id": ticket.id,
+                        "event_name": ticket.seat.zone.event_time.event.name,
+                        "event_date": ticket.seat.zone.event_time.event_date.isoformat(),
+                        "seat_number": ticket.seat.seat_number,
+                    }
+                    for ticket, email in zip(tickets_to_share, requested_emails)
+                ]
+                transaction.on_commit(lambda: _notify_shared_tickets(user.name, notifications))
 
                 return Response({"message": "Tickets shared successfully"}, status=status.HTTP_200_OK)
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+
+
+def _notify_shared_tickets(sharer_name, notifications):
+    # 공유는 이미 커밋됐으므로 브로커 장애로 응답이 실패하지 않도록 로그만 남김
+    try:
+        notify_shared_tickets.delay(sharer_name, notifications)
+    except Exception as e:
+        logger.error(f"[Share] 티켓 공유 알림 예약 실패: {e}")
+
+
+# 체크인 동기화 한 번에 받는 최대 토큰 수
+CHECKIN_SYNC_MAX_TOKENS = 1000
+
+# 티켓 QR 응답을 재검증 없이 쓰는 시간(초)
+TICKET_QR_MAX_AGE = 60
+
 # 등록된 얼굴 목록 반환 API
+FACE_LIST_DEFAULT_LIMIT = 100
+FACE_LIST_MAX_LIMIT = 1000
+
 @extend_schema(tags=["tickets"])
 class FaceListAPIView(APIView):
     authentication_classes = [JWTAuthentication]
@@ -812,7 +935,14 @@ class FaceListAPIView(APIView):
 
     @extend_schema(
         summary="등록된 얼굴 목록 조회",
-        description="AWS Rekognition Collection에 등록된 얼굴 목록을 반환합니다.",
+        description="로컬 얼굴 인덱스(face_registry)에서 등록된 얼굴 목록을 커서 페이지네이션으로 반환합니다. "
+                    "AWS 호출 없이 조회하며, 컬렉션과의 동기화는 sync_face_registry 커맨드로 수행합니다.",
+        parameters=[
+            OpenApiParameter(name='cursor', description='이전 응답의 next_cursor', required=False, type=int, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='limit', description=f'페이지당 개수 (최대 {FACE_LIST_MAX_LIMIT})', required=False, type=int, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='user_id', description='유저 ID로 필터', required=False, type=int, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='ticket_id', description='티켓 ID로 필터', required=False, type=int, location=OpenApiParameter.QUERY),
+        ],
         responses={
             200: OpenApiResponse(
                 response=OpenApiTypes.OBJECT,
@@ -824,12 +954,24 @@ class FaceListAPIView(APIView):
                             "data": [
                                 {"FaceId": "faceid123", "ExternalImageId": "user_2_ticket_1"},
                                 {"FaceId": "faceid456", "ExternalImageId": "user_3_ticket_2"}
-                            ]
+                            ],
+                            "next_cursor": 2
                         },
                         status_codes=["200"]
                     )
                 ]
             ),
+            400: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description="잘못된 쿼리 파라미터",
+                examples=[
+                    OpenApiExample(
+                        "BadRequest",
+                        value={"message": "cursor, limit, user_id, ticket_id는 정수여야 합니다."},
+                        status_codes=["400"]
+                    )
+                ]
+            ),
             500: OpenApiResponse(
                 response=OpenApiTypes.OBJECT,
                 description="서버 오류",
@@ -845,33 +987,29 @@ class FaceListAPIView(APIView):
     )
     def get(self, request):
         try:
-            rekognition = boto3.client(
-                'rekognition',
-                aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-                region_name='ap-northeast-2'
-            )
-            collection_id = 'my-tickets'
-            faces = []
-            response = rekognition.list_faces(CollectionId=collection_id, MaxResults=60)
-            faces.extend(response.get('Faces', []))
-            # NextToken 처리 (최대 1000개까지)
-            next_token = response.get('NextToken')
-            while next_token:
-                response = rekognition.list_faces(CollectionId=collection_id, NextToken=next_token, MaxResults=60)
-                faces.extend(response.get('Faces', []))
-                next_token = response.get('NextToken')
-            # 필요한 정보만 추려서 반환
-            data = [
-                {
-                    'FaceId': face['FaceId'],
-                    'ExternalImageId': face.get('ExternalImageId', '')
-                } for face in faces
-            ]
-            return Response({'data': data}, status=status.HTTP_200_OK)
+            cursor = int(request.GET.get('cursor', 0))
+            limit = min(int(request.GET.get('limit', FACE_LIST_DEFAULT_LIMIT)), FACE_LIST_MAX_LIMIT)
+            user_id = int(request.GET.get('user_id', 0))
+            ticket_id = int(request.GET.get('ticket_id', 0))
+        except ValueError:
+            return Response({'message': 'cursor, limit, user_id, ticket_id는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            limit = FACE_LIST_DEFAULT_LIMIT
+
+        try:
+            rows, next_cursor = list_registered_faces(cursor, limit, user_id=user_id, ticket_id=ticket_id)
         except Exception as e:
             return Response({'message': '목록 불러오기 실패', 'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        def stream():
+            yield '{"data": ['
+            for index, (_, face_id, external_image_id) in enumerate(rows):
+                item = json.dumps({'FaceId': face_id, 'ExternalImageId': external_image_id}, ensure_ascii=False)
+                yield item if index == 0 else ',' + item
+            yield '], "next_cursor": ' + json.dumps(next_cursor) + '}'
+
+        return StreamingHttpResponse(stream(), content_type='application/json')
+
 # 얼굴 삭제 API
 @extend_schema(tags=["tickets"])
 class FaceDeleteAPIView(APIView):
@@ -931,14 +1069,10 @@ class FaceDeleteAPIView(APIView):
         if not face_id:
             return Response({'message': 'face_id가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            rekognition = boto3.client(
-                'rekognition',
-                aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-                region_name='ap-northeast-2'
-            )
-            collection_id = 'my-tickets'
+            rekognition = get_rekognition_client()
+            collection_id = COLLECTION_ID
             rekognition.delete_faces(CollectionId=collection_id, FaceIds=[face_id])
+            forget_faces([face_id])
             return Response({'message': '삭제 성공'}, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'message': '삭제 실패', 'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -950,9 +1084,12 @@ class TicketQRView(APIView):
 
     @extend_schema(
         summary="티켓 QR 코드 생성",
-        description="티켓 ID로 QR 코드를 생성하여 base64 인코딩된 이미지를 반환합니다.",
+        description="티켓 ID로 QR 코드를 생성하여 반환합니다. type=base64(기본)는 base64 인코딩된 PNG 를 JSON 으로, "
+                    "type=png / type=svg 는 이미지를 그대로 반환합니다. "
+                    "ETag 를 내려주며 짧은 캐시 후 재검증하도록 하고, If-None-Match 가 같으면 304 를 반환합니다.",
         parameters=[
             OpenApiParameter(name='ticket_id', description='티켓 ID', required=True, type=int, location=OpenApiParameter.PATH),
+            OpenApiParameter(name='type', description='응답 형식 (base64/png/svg)', required=False, type=str, location=OpenApiParameter.QUERY),
         ],
         responses={
             200: OpenApiResponse(
@@ -983,29 +1120,52 @@ class TicketQRView(APIView):
         user = request.user
 
         try:
-            ticket = Ticket.objects.select_related('user', 'seat__zone__event_time').get(id=ticket_id, user=user)
+            ticket = Ticket.objects.select_related('seat__zone__event_time').get(id=ticket_id, user=user)
         except Ticket.DoesNotExist:
             return JsonResponse({'error': '티켓이 존재하지 않거나 접근 권한이 없습니다.'}, status=404)
 
+        qr_type = request.GET.get('type', 'base64')
+        if qr_type not in ('png', 'svg', 'base64'):
+            return JsonResponse({'error': 'type 은 png, svg, base64 중 하나여야 합니다.'}, status=400)
 
-        api_base_url=os.environ.get("API_BASE_URL")
-        qr_url = f"{api_base_url}/api/v1/tickets/{ticket.id}/checkin"
-
-        qr_img = qrcode.make(qr_url)
-        buffer = BytesIO()
-        qr_img.save(buffer, format="PNG")
-        image_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        # 같은 payload 의 QR 은 캐시에서 재사용 (tickets/qr.py)
+        digest, image = get_qr(ticket_qr_payload(ticket), 'svg' if qr_type == 'svg' else 'png')
 
-        return JsonResponse({"qr_base64": image_data})
+        # 내용 해시가 곧 ETag. 같은 URL 이라도 공유/취소로 토큰이 바뀌므로 오래 캐시하지 않고 ETag 로 재검증
+        etag = f'"{digest[:32]}-{qr_type}"'
+        headers = {'ETag': etag, 'Cache-Control': f'private, max-age={TICKET_QR_MAX_AGE}, must-revalidate'}
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponse(status=304)
+        elif qr_type == 'base64':
+            response = JsonResponse({"qr_base64": base64.b64encode(image).decode("utf-8")})
+        else:
+            response = HttpResponse(image, content_type='image/svg+xml' if qr_type == 'svg' else 'image/png')
+        for header, value in headers.items():
+            response[header] = value
+        return response
 
 
 
 # 2. 스태프용 티켓 확인 페이지 (HTML 렌더링)
 def checkin_ticket_view(request, ticket_id):
+    # QR 의 서명 토큰부터 검증 (위조/만료/다른 티켓 토큰은 DB 조회 없이 거절)
+    token = request.GET.get('token')
+    claims = None
+    if token is not None:
+        try:
+            claims = read_checkin_token(token)
+        except InvalidCheckinToken:
+            return render(request, 'invalid_ticket.html', status=403)
+        if claims['ticket_id'] != ticket_id:
+            return render(request, 'invalid_ticket.html', status=403)
+
     try:
-        ticket = Ticket.objects.select_related('user', 'seat__zone__event_time').get(id=ticket_id)
+        ticket = Ticket.objects.select_related('user', 'seat__zone__event_time__event').get(id=ticket_id)
     except Ticket.DoesNotExist:
         return render(request, 'invalid_ticket.html', status=404)
+    # 공유/취소 전에 발급된 QR
+    if claims is not None and not is_current(claims, ticket):
+        return render(request, 'invalid_ticket.html', status=403)
 
     image_url = ticket.seat.zone.event_time.event.image_url
 
@@ -1021,6 +1181,103 @@ def checkin_ticket_view(request, ticket_id):
 
     return render(request, 'checkin_ticket.html', context)
 
+@extend_schema(tags=["tickets"])
+class CheckinSyncAPIView(APIView):
+    # 입장 게이트 스캐너가 오프라인으로 검증한 체크인을 모아서 올리는 API (스태프 계정)
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="체크인 일괄 동기화",
+        description="스캐너가 QR 서명 토큰으로 검증한 체크인 목록을 받아 서명을 다시 확인한 뒤 "
+                    "reserved 티켓을 한 번에 checked_in 으로 바꿉니다. "
+                    "이미 체크인된 티켓은 duplicated, 취소 등으로 체크인할 수 없는 티켓과 잘못되었거나 공유/취소로 대체된 토큰은 rejected 로 돌려줍니다. "
+                    "event_time_ids 를 보내면 해당 회차에서 공유/취소된 티켓의 revoked 목록을 함께 돌려주며, "
+                    "스캐너는 revoked 에 있는 티켓의 토큰 버전(v)이 valid_version 과 다르면(null 이면 항상) 거절합니다.",
+        request={
+            'application/json': {
+                'type': 'object',
+                'properties': {
+                    'tokens': {'type': 'array', 'items': {'type': 'string'}, 'description': 'QR 체크인 토큰 목록'},
+                    'event_time_ids': {'type': 'array', 'items': {'type': 'integer'}, 'description': 'revoked 목록을 받을 공연 회차 ID 목록'},
+                },
+                'required': ['tokens']
+            }
+        },
+        responses={
+            200: OpenApiResponse(
+                response=OpenApiTypes.OBJECT,
+                description="동기화 결과",
+                examples=[
+                    OpenApiExample(
+                        "Success",
+                        value={"checked_in": [101, 102], "duplicated": [99],
+                               "rejected": [{"token": "eyJlIjo...", "reason": "유효 기간이 지난 QR 입니다."}],
+                               "revoked": [{"ticket_id": 103, "valid_version": 2}, {"ticket_id": 104, "valid_version": None}]},
+                        status_codes=["200"]
+                    )
+                ]
+            ),
+            400: OpenApiResponse(description="tokens / event_time_ids 형식 오류"),
+        }
+    )
+    def post(self, request):
+        tokens = request.data.get('tokens')
+        if not isinstance(tokens, list) or len(tokens) > CHECKIN_SYNC_MAX_TOKENS:
+            return Response({'error': f'tokens 는 최대 {CHECKIN_SYNC_MAX_TOKENS}개의 리스트여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        event_time_ids = request.data.get('event_time_ids', [])
+        if not isinstance(event_time_ids, list) or not all(isinstance(event_time_id, int) for event_time_id in event_time_ids):
+            return Response({'error': 'event_time_ids 는 정수 리스트여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        verified, rejected = [], []
+        for token in tokens:
+            try:
+                verified.append((token, read_checkin_token(str(token))))
+            except InvalidCheckinToken as e:
+                rejected.append({'token': token, 'reason': str(e)})
+
+        with transaction.atomic():
+            tickets = {
+                ticket.id: ticket
+                for ticket in Ticket.objects.select_for_update()
+                .filter(id__in=[claims['ticket_id'] for _, claims in verified])
+                .only('id', 'ticket_status', 'user_id', 'checkin_version')
+            }
+            # 공유/취소 전에 발급된 토큰은 서명이 맞아도 거절
+            ticket_ids = set()
+            for token, claims in verified:
+                ticket = tickets.get(claims['ticket_id'])
+                if ticket is not None and not is_current(claims, ticket):
+                    rejected.append({'token': token, 'reason': '공유 또는 취소로 대체된 QR 입니다.'})
+                else:
+                    ticket_ids.add(claims['ticket_id'])
+            statuses = {ticket_id: tickets[ticket_id].ticket_status for ticket_id in ticket_ids if ticket_id in tickets}
+            to_check_in = sorted(ticket_id for ticket_id, ticket_status in statuses.items() if ticket_status == 'reserved')
+            Ticket.objects.filter(id__in=to_check_in).update(ticket_status='checked_in', updated_at=timezone.now())
+
+        duplicated = sorted(ticket_id for ticket_id, ticket_status in statuses.items() if ticket_status == 'checked_in')
+        rejected += [
+            {'ticket_id': ticket_id, 'reason': f"체크인할 수 없는 상태입니다: {statuses.get(ticket_id, '없음')}"}
+            for ticket_id in sorted(ticket_ids)
+            if statuses.get(ticket_id) not in ('reserved', 'checked_in')
+        ]
+
+        # 스캐너가 오프라인에서도 이전 QR 을 거절할 수 있도록 공유/취소된 티켓의 현재 버전을 내려줌 (취소는 null)
+        revoked = [
+            {'ticket_id': ticket_id, 'valid_version': None if ticket_status == 'canceled' else checkin_version}
+            for ticket_id, ticket_status, checkin_version in Ticket.objects
+            .filter(seat__zone__event_time_id__in=event_time_ids)
+            .filter(Q(checkin_version__gt=1) | Q(ticket_status='canceled'))
+            .order_by('id')
+            .values_list('id', 'ticket_status', 'checkin_version')
+        ] if event_time_ids else []
+        return Response(
+            {'checked_in': to_check_in, 'duplicated': duplicated, 'rejected': rejected, 'revoked': revoked},
+            status=status.HTTP_200_OK
+        )
+
+
 def face_register_page(request):
     return render(request, 'tickets/face_register.html')
 
@@ -1084,12 +1341,7 @@ class FaceGuideCheckAPIView(APIView):
         img_bytes = base64.b64decode(image_data)
 
         # AWS Rekognition 호출
-        rekognition = boto3.client(
-            'rekognition',
-            aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
-            region_name='ap-northeast-2'
-        )
+        rekognition = get_rekognition_client()
         result = rekognition.detect_faces(
             Image={'Bytes': img_bytes},
             Attributes=['DEFAULT']
@@ -1,9 +1,6 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 
-class Meta:
-    db_table = 'user'
-
 class UserManager(BaseUserManager):
     def create_user(self, email, password, name, phone, **extra_fields):
         if not email:
@@ -47,5 +44,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name', 'phone']
 
+    class Meta:
+        db_table = 'user'
+
     def __str__(self):
         return self.email